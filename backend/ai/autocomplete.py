@@ -0,0 +1,306 @@
+import threading
+from typing import List, Dict, Any, Iterable, Optional
+
+# Suggestions kept per trie node; lookups never return more than this
+NODE_TOP_SIZE = 20
+
+# Memoized lookups (mostly typo walks), dropped whenever the index changes
+RESULT_CACHE_SIZE = 1024
+
+# Always-available suggestions, ranked below any real content
+SEED_SUGGESTIONS = [
+    "projects",
+    "skills and technologies",
+    "work experience",
+    "education",
+    "blog posts",
+    "contact information",
+    "resume",
+    "certifications",
+    "achievements"
+]
+SEED_WEIGHT = 0.5
+
+# Ranking boost per successful search for a term
+SEARCH_BOOST = 0.1
+
+
+def suggestion_terms(metadata: Dict[str, Any]) -> List[str]:
+    """
+    Extract autocomplete terms from a knowledge base document's metadata
+    
+    Uses titles (project, skill and blog titles), tags, tech stacks and
+    organizations. The resume document contributes nothing.
+    """
+    doc_type = metadata.get("type")
+    terms = []
+    if doc_type in ("project", "skill", "blog") and metadata.get("title"):
+        terms.append(metadata["title"])
+    if doc_type == "experience" and metadata.get("organization"):
+        terms.append(metadata["organization"])
+    for key in ("tags", "tech_stack"):
+        terms.extend(value for value in metadata.get(key) or [] if isinstance(value, str))
+    return [term.strip() for term in terms if term and term.strip()]
+
+
+class _Node:
+    """Trie node; `top` caches the best term keys in this subtree"""
+    
+    __slots__ = ("children", "terms", "top")
+    
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.terms: set = set()
+        self.top: Optional[List[str]] = None
+
+
+class AutocompleteIndex:
+    """
+    Prefix trie of portfolio terms with popularity ranking and typo tolerance
+    
+    Every word start of a term is indexed ("machine learning" is reachable
+    from "mach" and "lear"). Each node caches its best NODE_TOP_SIZE terms,
+    so an exact prefix lookup is a walk of len(prefix) nodes. Updates only
+    invalidate the caches along the affected paths. When exact matches run
+    short, a bounded Levenshtein walk of the trie adds terms whose prefix is
+    within 1-2 edits of the query.
+    
+    A term's weight is its source count (how many documents contribute it,
+    plus SEED_WEIGHT for seeds) plus its search boost. Only the source
+    count decides whether a term exists: it is dropped when its last
+    source goes, however often it was searched.
+    """
+    
+    def __init__(self):
+        """Create an empty index holding only the seed suggestions"""
+        self._lock = threading.RLock()
+        self._reset()
+    
+    def _reset(self):
+        """Drop every term and re-add the seed suggestions"""
+        self._root = _Node()
+        self._terms: Dict[str, Dict[str, Any]] = {}  # key -> {"display", "count", "boost", "weight"}
+        self._sources: Dict[str, List[str]] = {}  # source_id -> contributed terms
+        self._results: Dict[tuple, List[str]] = {}
+        for suggestion in SEED_SUGGESTIONS:
+            self._add_term(suggestion, SEED_WEIGHT)
+    
+    @staticmethod
+    def _key(term: str) -> str:
+        """Normalized lookup key for a term"""
+        return " ".join(term.lower().split())
+    
+    @staticmethod
+    def _word_starts(key: str) -> List[str]:
+        """Suffixes of key starting at each word"""
+        words = key.split(" ")
+        return [" ".join(words[i:]) for i in range(len(words))]
+    
+    # Maintenance
+    def set_source(self, source_id: str, terms: Iterable[str]):
+        """
+        Replace the terms contributed by one source (e.g. a document)
+        
+        Args:
+            source_id: Source identifier, such as 'project_3'
+            terms: Terms it contributes; repeated terms add weight
+        """
+        terms = list(terms)
+        with self._lock:
+            self.remove_source(source_id)
+            for term in terms:
+                self._add_term(term, 1.0)
+            if terms:
+                self._sources[source_id] = terms
+    
+    def remove_source(self, source_id: str):
+        """Withdraw every term contributed by a source"""
+        with self._lock:
+            for term in self._sources.pop(source_id, []):
+                self._add_term(term, -1.0)
+    
+    def record_search(self, query: str):
+        """Boost an existing term that users actually search for"""
+        key = self._key(query)
+        with self._lock:
+            entry = self._terms.get(key)
+            if entry is not None:
+                entry["boost"] += SEARCH_BOOST
+                entry["weight"] = entry["count"] + entry["boost"]
+                self._results.clear()
+                for start in self._word_starts(key):
+                    self._invalidate(start)
+    
+    def clear(self):
+        """Remove all content terms (seed suggestions stay)"""
+        with self._lock:
+            self._reset()
+    
+    def _add_term(self, term: str, amount: float):
+        """Adjust a term's source count, inserting or removing it from the trie"""
+        key = self._key(term)
+        entry = self._terms.get(key)
+        if entry is None:
+            if amount <= 0:
+                return
+            entry = self._terms[key] = {"display": term, "count": 0.0, "boost": 0.0, "weight": 0.0}
+            for start in self._word_starts(key):
+                self._insert(start, key)
+        
+        self._results.clear()
+        entry["count"] += amount
+        entry["weight"] = entry["count"] + entry["boost"]
+        if entry["count"] <= 1e-9:
+            del self._terms[key]
+            for start in self._word_starts(key):
+                self._remove(start, key)
+        else:
+            for start in self._word_starts(key):
+                self._invalidate(start)
+    
+    def _insert(self, path: str, key: str):
+        node = self._root
+        node.top = None
+        for char in path:
+            node = node.children.setdefault(char, _Node())
+            node.top = None
+        node.terms.add(key)
+    
+    def _remove(self, path: str, key: str):
+        nodes = [self._root]
+        for char in path:
+            child = nodes[-1].children.get(char)
+            if child is None:
+                return
+            nodes.append(child)
+        nodes[-1].terms.discard(key)
+        for node in nodes:
+            node.top = None
+        # Prune empty branches
+        for depth in range(len(path), 0, -1):
+            node = nodes[depth]
+            if node.terms or node.children:
+                break
+            del nodes[depth - 1].children[path[depth - 1]]
+    
+    def _invalidate(self, path: str):
+        node = self._root
+        node.top = None
+        for char in path:
+            node = node.children.get(char)
+            if node is None:
+                return
+            node.top = None
+    
+    def _top(self, node: _Node) -> List[str]:
+        """Best term keys in a subtree, computed from the children's caches"""
+        if node.top is None:
+            candidates = set(node.terms)
+            for child in node.children.values():
+                candidates.update(self._top(child))
+            node.top = sorted(candidates, key=lambda key: (-self._terms[key]["weight"], key))[:NODE_TOP_SIZE]
+        return node.top
+    
+    # Lookup
+    def suggest(self, prefix: str, limit: int = 5) -> List[str]:
+        """
+        Suggest terms for a partial query
+        
+        Args:
+            prefix: Partial query
+            limit: Maximum number of suggestions
+        
+        Returns:
+            Display strings; exact prefix matches by popularity first, then
+            near matches by edit distance and popularity
+        """
+        key = self._key(prefix)
+        if not key:
+            return []
+        
+        with self._lock:
+            cached = self._results.get((key, limit))
+            if cached is not None:
+                return list(cached)
+            
+            ranked: List[str] = []
+            node = self._root
+            for char in key:
+                node = node.children.get(char)
+                if node is None:
+                    break
+            else:
+                ranked = list(self._top(node))
+            
+            max_distance = 0 if len(key) <= 3 else 1 if len(key) <= 6 else 2
+            if len(ranked) < limit and max_distance:
+                seen = set(ranked)
+                fuzzy = self._fuzzy(key, max_distance)
+                for term_key, _ in sorted(fuzzy.items(), key=lambda item: (item[1], -self._terms[item[0]]["weight"])):
+                    if term_key not in seen:
+                        ranked.append(term_key)
+                        seen.add(term_key)
+            
+            suggestions = [self._terms[term_key]["display"] for term_key in ranked[:limit]]
+            if len(self._results) >= RESULT_CACHE_SIZE:
+                self._results.clear()
+            self._results[(key, limit)] = suggestions
+            return list(suggestions)
+    
+    def _fuzzy(self, key: str, max_distance: int) -> Dict[str, int]:
+        """
+        Terms whose indexed prefix is within max_distance edits of key
+        
+        Walks the trie carrying one edit-distance row per node (adjacent
+        transpositions count as one edit) and prunes branches whose row
+        minimum exceeds max_distance. The first character must match, which
+        keeps the walk small and is where typos are rarest.
+        """
+        matches: Dict[str, int] = {}
+        start = self._root.children.get(key[0])
+        if start is None:
+            return matches
+        
+        root_row = list(range(len(key) + 1))
+        start_row = self._next_row(key, key[0], root_row, None, "")
+        self._collect(start, start_row, max_distance, matches)
+        stack = [(char, child, start_row, root_row, key[0]) for char, child in start.children.items()]
+        while stack:
+            char, node, previous, before, previous_char = stack.pop()
+            row = self._next_row(key, char, previous, before, previous_char)
+            self._collect(node, row, max_distance, matches)
+            if min(row) <= max_distance:
+                stack.extend((c, child, row, previous, char) for c, child in node.children.items())
+        return matches
+    
+    @staticmethod
+    def _next_row(key: str, char: str, previous: List[int], before: Optional[List[int]], previous_char: str) -> List[int]:
+        """Edit-distance row after appending char to the trie path"""
+        row = [previous[0] + 1]
+        for i in range(1, len(key) + 1):
+            cost = min(
+                previous[i] + 1,
+                row[i - 1] + 1,
+                previous[i - 1] + (key[i - 1] != char)
+            )
+            if before is not None and i > 1 and key[i - 1] == previous_char and key[i - 2] == char:
+                cost = min(cost, before[i - 2] + 1)
+            row.append(cost)
+        return row
+    
+    def _collect(self, node: _Node, row: List[int], max_distance: int, matches: Dict[str, int]):
+        """Record a node's best terms if its path matches the query closely enough"""
+        if row[-1] <= max_distance:
+            for term_key in self._top(node):
+                if matches.get(term_key, max_distance + 1) > row[-1]:
+                    matches[term_key] = row[-1]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+        
+        Returns:
+            Dictionary with term and source counts
+        """
+        with self._lock:
+            return {"terms": len(self._terms), "sources": len(self._sources)}
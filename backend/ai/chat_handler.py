@@ -1,6 +1,8 @@
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from .knowledge_base import knowledge_base
 from config import settings
+from metrics import ai_stage_duration_seconds
 
 
 class ChatHandler:
@@ -29,6 +31,28 @@ Always be professional, concise, and helpful."""
         Returns:
             Dictionary with response and sources
         """
+        relevant_docs, sources, context = self.retrieve(query)
+        
+        # Generate response (simple template-based for now)
+        # In production, this would use an LLM like OpenAI GPT
+        response = self._generate_template_response(query, context, relevant_docs)
+        
+        return {
+            "response": response,
+            "sources": sources[:3],  # Top 3 sources
+            "context_used": len(relevant_docs) > 0
+        }
+    
+    def retrieve(self, query: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], str]:
+        """
+        Retrieve the context for a query from the knowledge base
+        
+        Args:
+            query: User's question or message
+            
+        Returns:
+            (relevant documents, source references, context text)
+        """
         # Search knowledge base for relevant context
         relevant_docs = knowledge_base.search(query, n_results=5)
         
@@ -44,17 +68,32 @@ Always be professional, concise, and helpful."""
                 "id": doc['id']
             })
         
-        context = "\n\n".join(context_parts)
-        
-        # Generate response (simple template-based for now)
-        # In production, this would use an LLM like OpenAI GPT
-        response = self._generate_template_response(query, context, relevant_docs)
+        return relevant_docs, sources, "\n\n".join(context_parts)
+    
+    def stream_response(
+        self,
+        query: str,
+        relevant_docs: List[Dict[str, Any]],
+        context: str,
+        cancelled: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """
+        Generate a response one segment at a time
         
-        return {
-            "response": response,
-            "sources": sources[:3],  # Top 3 sources
-            "context_used": len(relevant_docs) > 0
-        }
+        Args:
+            query: User's question or message
+            relevant_docs: Documents from retrieve()
+            context: Context text from retrieve()
+            cancelled: Set when the client has gone away; generation stops
+                before the next segment
+            
+        Yields:
+            Response segments; joined they equal the full response
+        """
+        for segment in self._template_segments(query, context, relevant_docs):
+            if cancelled is not None and cancelled.is_set():
+                return
+            yield segment
     
     def _generate_template_response(self, query: str, context: str, docs: List[Dict]) -> str:
         """
@@ -69,48 +108,55 @@ Always be professional, concise, and helpful."""
         Returns:
             Generated response string
         """
+        with ai_stage_duration_seconds.time(stage="chat_template"):
+            return "".join(self._template_segments(query, context, docs))
+    
+    def _template_segments(self, query: str, context: str, docs: List[Dict]) -> Iterator[str]:
+        """Produce the template-based response as a heading plus one segment per item"""
         query_lower = query.lower()
         
         # Check if we have relevant context
         if not docs:
-            return ("I don't have specific information about that in my knowledge base. "
+            yield ("I don't have specific information about that in my knowledge base. "
                    "Feel free to ask me about projects, skills, experience, or blog posts!")
+            return
         
         # Simple keyword-based responses
         if any(word in query_lower for word in ["project", "projects", "built", "created"]):
             project_docs = [d for d in docs if d['metadata'].get('type') == 'project']
             if project_docs:
-                response = "Here are some relevant projects:\n\n"
+                yield "Here are some relevant projects:\n\n"
                 for doc in project_docs[:3]:
-                    response += f"• {doc['metadata'].get('title', 'Project')}: {doc['text'][:150]}...\n\n"
-                return response
+                    yield f"• {doc['metadata'].get('title', 'Project')}: {doc['text'][:150]}...\n\n"
+                return
         
         elif any(word in query_lower for word in ["skill", "skills", "technology", "tech"]):
             skill_docs = [d for d in docs if d['metadata'].get('type') == 'skill']
             if skill_docs:
-                response = "Here are relevant skills:\n\n"
+                yield "Here are relevant skills:\n\n"
                 for doc in skill_docs[:5]:
-                    response += f"• {doc['text']}\n"
-                return response
+                    yield f"• {doc['text']}\n"
+                return
         
         elif any(word in query_lower for word in ["experience", "work", "job", "worked"]):
             exp_docs = [d for d in docs if d['metadata'].get('type') == 'experience']
             if exp_docs:
-                response = "Here's relevant work experience:\n\n"
+                yield "Here's relevant work experience:\n\n"
                 for doc in exp_docs[:3]:
-                    response += f"• {doc['text']}\n\n"
-                return response
+                    yield f"• {doc['text']}\n\n"
+                return
         
         elif any(word in query_lower for word in ["blog", "article", "wrote", "writing"]):
             blog_docs = [d for d in docs if d['metadata'].get('type') == 'blog']
             if blog_docs:
-                response = "Here are some relevant blog posts:\n\n"
+                yield "Here are some relevant blog posts:\n\n"
                 for doc in blog_docs[:3]:
-                    response += f"• {doc['metadata'].get('title', 'Post')}: {doc['text'][:100]}...\n\n"
-                return response
+                    yield f"• {doc['metadata'].get('title', 'Post')}: {doc['text'][:100]}...\n\n"
+                return
         
         # Default response with context
-        return f"Based on the portfolio information:\n\n{docs[0]['text'][:300]}...\n\nWould you like to know more about specific projects, skills, or experience?"
+        yield f"Based on the portfolio information:\n\n{docs[0]['text'][:300]}...\n\n"
+        yield "Would you like to know more about specific projects, skills, or experience?"
 
 
 # Global instance
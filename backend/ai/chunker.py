@@ -0,0 +1,140 @@
+import re
+from typing import Iterator, List, Dict, Any, Iterable
+
+# Separates a parent document ID from the chunk number ("blog_3#2")
+CHUNK_ID_SEPARATOR = "#"
+
+# Metadata added to every chunk, stripped again from search results
+CHUNK_METADATA_KEYS = ("parent_id", "chunk", "chunks")
+
+# A sentence ends at . ! or ? followed by whitespace, or at a blank line
+SENTENCE_PATTERN = re.compile(r"\S.*?(?:[.!?]+[\"')\]]*(?=\s)|\n\s*\n|\Z)", re.DOTALL)
+
+
+def parent_id(doc_id: str) -> str:
+    """Parent document ID of a chunk ID (unchanged for unchunked IDs)"""
+    return doc_id.split(CHUNK_ID_SEPARATOR, 1)[0]
+
+
+def iter_sentences(text: str) -> Iterator[str]:
+    """Yield sentences lazily without splitting the whole text up front"""
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().strip()
+        if sentence:
+            yield sentence
+
+
+def chunk_text(text: str, max_words: int = 200, overlap_words: int = 40) -> Iterator[str]:
+    """
+    Split long text into overlapping, sentence-bounded chunks
+    
+    Chunks hold whole sentences up to max_words words; each chunk repeats
+    the trailing sentences of the previous one (up to overlap_words words)
+    so context spanning a boundary is searchable. Sentences longer than
+    max_words are cut into word windows. Text that already fits is yielded
+    unchanged.
+    
+    Args:
+        text: Text to split
+        max_words: Maximum words per chunk
+        overlap_words: Maximum words repeated from the previous chunk
+    
+    Yields:
+        Chunk texts, in order
+    """
+    if len(text.split()) <= max_words:
+        yield text
+        return
+    
+    current: List[List[str]] = []
+    count = 0
+    for sentence in iter_sentences(text):
+        words = sentence.split()
+        for start in range(0, len(words), max_words):
+            piece = words[start:start + max_words]
+            if current and count + len(piece) > max_words:
+                yield " ".join(word for part in current for word in part)
+                
+                # Carry trailing sentences over, leaving room for this piece
+                budget = min(overlap_words, max_words - len(piece))
+                kept: List[List[str]] = []
+                kept_count = 0
+                for part in reversed(current):
+                    if kept_count + len(part) > budget:
+                        break
+                    kept.insert(0, part)
+                    kept_count += len(part)
+                current, count = kept, kept_count
+            
+            current.append(piece)
+            count += len(piece)
+    
+    if current:
+        yield " ".join(word for part in current for word in part)
+
+
+def chunk_documents(documents: Iterable[Dict[str, Any]], max_words: int = 200, overlap_words: int = 40) -> Iterator[Dict[str, Any]]:
+    """
+    Expand knowledge base documents into chunk documents
+    
+    A document that fits in one chunk keeps its ID; longer ones become
+    '<id>#<n>' chunks, with the title repeated on every chunk after the
+    first. Every chunk carries 'parent_id', 'chunk' (index) and 'chunks'
+    (count) metadata, so results can be collapsed per parent and chunks
+    left over from an older version of the parent can be found.
+    Documents are consumed one at a time.
+    
+    Args:
+        documents: Dicts with 'id', 'text', and 'metadata' keys
+        max_words: Maximum words per chunk
+        overlap_words: Maximum words repeated between chunks
+    
+    Yields:
+        Chunk documents with the same keys
+    """
+    for document in documents:
+        doc_id, metadata = document["id"], document["metadata"]
+        chunks = list(chunk_text(document["text"], max_words, overlap_words))
+        if len(chunks) == 1:
+            yield {
+                "id": doc_id,
+                "text": chunks[0],
+                "metadata": {**metadata, "parent_id": doc_id, "chunk": 0, "chunks": 1}
+            }
+            continue
+        
+        for number, chunk in enumerate(chunks):
+            if number and metadata.get("title"):
+                chunk = f"{metadata['title']}. {chunk}"
+            yield {
+                "id": f"{doc_id}{CHUNK_ID_SEPARATOR}{number}",
+                "text": chunk,
+                "metadata": {**metadata, "parent_id": doc_id, "chunk": number, "chunks": len(chunks)}
+            }
+
+
+def collapse_chunks(results: List[Dict[str, Any]], n_results: int) -> List[Dict[str, Any]]:
+    """
+    Keep the best-ranked chunk of each parent document
+    
+    Args:
+        results: Ranked search results (best first) over chunk documents
+        n_results: Number of parents to return
+    
+    Returns:
+        Results keyed by parent ID, with the chunk bookkeeping removed from
+        the metadata; the text is the matching chunk
+    """
+    collapsed = []
+    seen = set()
+    for result in results:
+        metadata = result["metadata"]
+        parent = metadata.get("parent_id") or parent_id(result["id"])
+        if parent in seen:
+            continue
+        seen.add(parent)
+        metadata = {key: value for key, value in metadata.items() if key not in CHUNK_METADATA_KEYS}
+        collapsed.append({**result, "id": parent, "metadata": metadata})
+        if len(collapsed) == n_results:
+            break
+    return collapsed
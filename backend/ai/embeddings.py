@@ -1,16 +1,60 @@
-from sentence_transformers import SentenceTransformer
+import threading
 from typing import List
 import numpy as np
 from config import settings
+from metrics import ai_stage_duration_seconds
+from .embedding_cache import EmbeddingCache
+from .query_cache import LRUCache, normalize_query
+from .micro_batcher import MicroBatcher
 
 
 class EmbeddingGenerator:
     """Generate embeddings for text using sentence-transformers"""
     
     def __init__(self):
-        """Initialize the embedding model"""
-        self.model = SentenceTransformer(settings.AI_MODEL_NAME)
+        """Initialize the generator; the model itself is loaded on first use"""
+        self._model = None
+        self._model_lock = threading.Lock()
         self.dimension = settings.EMBEDDING_DIMENSION
+        self.cache = None
+        if settings.EMBEDDING_CACHE_ENABLED:
+            self.cache = EmbeddingCache(
+                settings.EMBEDDING_CACHE_PATH,
+                settings.AI_MODEL_NAME,
+                settings.EMBEDDING_CACHE_MAX_ENTRIES
+            )
+        
+        # In-process cache for query embeddings (popular queries repeat a lot)
+        self.query_cache = LRUCache(
+            settings.QUERY_CACHE_MAX_ENTRIES,
+            settings.QUERY_CACHE_MAX_BYTES,
+            settings.QUERY_CACHE_TTL_SECONDS
+        )
+        
+        # Concurrent single-query encodes share one model.encode call
+        self.batcher = None
+        if settings.EMBEDDING_MICRO_BATCHING:
+            self.batcher = MicroBatcher(
+                self._encode_many,
+                settings.EMBEDDING_BATCH_MAX_SIZE,
+                settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+                name="embedding-batcher"
+            )
+    
+    @property
+    def model(self):
+        """SentenceTransformer model, loaded lazily (importing torch is slow)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(settings.AI_MODEL_NAME)
+        return self._model
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model has been loaded"""
+        return self._model is not None
     
     def generate(self, text: str) -> List[float]:
         """
@@ -22,21 +66,57 @@ class EmbeddingGenerator:
         Returns:
             List of floats representing the embedding vector
         """
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        with ai_stage_duration_seconds.time(stage="embedding"):
+            key = normalize_query(text)
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            if self.batcher is not None:
+                embedding = self.batcher.submit(text)
+            else:
+                embedding = self.model.encode(text, convert_to_numpy=True).tolist()
+            self.query_cache.set(key, embedding)
+            return embedding
+    
+    def _encode_many(self, texts: List[str]) -> List[List[float]]:
+        """Encode a micro-batch of texts in a single model call"""
+        return self.model.encode(texts, convert_to_numpy=True).tolist()
     
     def generate_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts
         
+        Texts already in the embedding cache are not re-encoded; only cache
+        misses are sent to the model.
+        
         Args:
             texts: List of input text strings
             
         Returns:
             List of embedding vectors
         """
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        if not texts:
+            return []
+        
+        if self.cache is None:
+            embeddings = self.model.encode(texts, convert_to_numpy=True)
+            return embeddings.tolist()
+        
+        results = self.cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+        
+        if missing:
+            # Encode each distinct missing text once
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = self.model.encode(missing_texts, convert_to_numpy=True).tolist()
+            self.cache.put_many(missing_texts, encoded)
+            
+            by_text = dict(zip(missing_texts, encoded))
+            for i in missing:
+                results[i] = by_text[texts[i]]
+        
+        return results
     
     def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
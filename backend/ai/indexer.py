@@ -0,0 +1,359 @@
+import threading
+import time
+import uuid
+from collections import deque
+from typing import List, Dict, Any, Iterator, Optional
+from sqlalchemy.orm import Session
+from config import settings
+from database import SessionLocal
+from metrics import ai_last_reindex_documents, ai_reindexed_documents_total, ai_stage_duration_seconds
+from models import Project, Skill, Experience, Blog, Resume
+from .knowledge_base import knowledge_base
+
+# Blog posts loaded per database round trip during a full reindex
+BLOG_PAGE_SIZE = 50
+
+
+# Knowledge base document builders
+# Each builder returns the document for one entity, keyed by "<type>_<id>",
+# so a single entity can be upserted or deleted without a full rebuild.
+def project_document(project: Project) -> dict:
+    """Build the knowledge base document for a project"""
+    text = f"{project.title}. {project.description}"
+    if project.long_description:
+        text += f" {project.long_description}"
+    if project.tech_stack:
+        text += f" Technologies: {', '.join(project.tech_stack)}"
+    
+    return {
+        "id": f"project_{project.id}",
+        "text": text,
+        "metadata": {
+            "type": "project",
+            "title": project.title,
+            "category": project.category,
+            "tags": project.tags or [],
+            "tech_stack": project.tech_stack or []
+        }
+    }
+
+
+def skill_document(skill: Skill) -> dict:
+    """Build the knowledge base document for a skill"""
+    text = f"{skill.name} - {skill.category} skill with {skill.proficiency*100}% proficiency"
+    if skill.years_experience:
+        text += f", {skill.years_experience} years of experience"
+    
+    return {
+        "id": f"skill_{skill.id}",
+        "text": text,
+        "metadata": {
+            "type": "skill",
+            "title": skill.name,
+            "category": skill.category
+        }
+    }
+
+
+def experience_document(exp: Experience) -> dict:
+    """Build the knowledge base document for an experience entry"""
+    text = f"{exp.title} at {exp.organization}"
+    if exp.description:
+        text += f". {exp.description}"
+    if exp.achievements:
+        text += f" Achievements: {' '.join(exp.achievements)}"
+    
+    return {
+        "id": f"experience_{exp.id}",
+        "text": text,
+        "metadata": {
+            "type": "experience",
+            "title": f"{exp.title} at {exp.organization}",
+            "organization": exp.organization
+        }
+    }
+
+
+def blog_document(blog: Blog) -> dict:
+    """Build the knowledge base document for a blog post"""
+    # Full content; long posts are split into chunks by the knowledge base
+    text = f"{blog.title}. {blog.excerpt or ''} {blog.content}"
+    
+    return {
+        "id": f"blog_{blog.id}",
+        "text": text,
+        "metadata": {
+            "type": "blog",
+            "title": blog.title,
+            "tags": blog.tags or []
+        }
+    }
+
+
+def resume_document(resume: Resume) -> dict:
+    """Build the knowledge base document for the resume"""
+    text = f"{resume.full_name} - {resume.title or 'Professional'}. {resume.summary or ''}"
+    if resume.pdf_text:
+        text += f" {resume.pdf_text}"
+    
+    return {
+        "id": "resume_1",
+        "text": text,
+        "metadata": {
+            "type": "resume",
+            "title": "Resume"
+        }
+    }
+
+
+def reindex_knowledge_base(db: Session) -> int:
+    """
+    Reindex all portfolio data in the knowledge base
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        Number of documents indexed
+    """
+    count = 0
+    
+    def documents():
+        nonlocal count
+        for document in iter_portfolio_documents(db):
+            count += 1
+            yield document
+    
+    with ai_stage_duration_seconds.time(stage="reindex"), knowledge_base.bulk_write():
+        # Clear existing data
+        knowledge_base.clear_all()
+        
+        # Streamed into the knowledge base, which embeds in bounded batches
+        knowledge_base.add_documents_batch(documents())
+    
+    ai_reindexed_documents_total.inc(count)
+    ai_last_reindex_documents.set(count)
+    return count
+
+
+def iter_portfolio_documents(db: Session) -> Iterator[dict]:
+    """
+    Yield the knowledge base document for every portfolio entity
+    
+    Blog posts are read in pages so long content is never loaded all at once.
+    """
+    for project in db.query(Project).all():
+        yield project_document(project)
+    for skill in db.query(Skill).all():
+        yield skill_document(skill)
+    for exp in db.query(Experience).all():
+        yield experience_document(exp)
+    for blog in db.query(Blog).filter(Blog.published == True).order_by(Blog.id).yield_per(BLOG_PAGE_SIZE):
+        yield blog_document(blog)
+    
+    resume = db.query(Resume).first()
+    if resume:
+        yield resume_document(resume)
+
+
+class ReindexJob:
+    """A single queued knowledge base update"""
+    
+    def __init__(self, kind: str, doc_id: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind  # "full", "upsert" or "delete"
+        self.doc_id = doc_id
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the job for the status API"""
+        now = time.time()
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "doc_id": self.doc_id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_seconds": (self.started_at or now) - self.created_at,
+            "run_seconds": (self.finished_at or now) - self.started_at if self.started_at else None
+        }
+
+
+class ReindexWorker:
+    """
+    Background worker that applies knowledge base updates off the request path
+    
+    Jobs submitted within REINDEX_DEBOUNCE_SECONDS of each other are merged
+    into one run: per-entity updates collapse to the latest operation for each
+    document ID, and a queued full reindex supersedes them all. A steady
+    stream of edits is applied at the latest REINDEX_MAX_WAIT_SECONDS after
+    the oldest of them was queued.
+    """
+    
+    def __init__(self, debounce_seconds: float = None, history_size: int = None, max_wait_seconds: float = None):
+        """Initialize the worker (call start() to launch the thread)"""
+        self.debounce_seconds = (
+            settings.REINDEX_DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        )
+        self.max_wait_seconds = (
+            settings.REINDEX_MAX_WAIT_SECONDS if max_wait_seconds is None else max_wait_seconds
+        )
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._first_submit = 0.0
+        self._last_submit = 0.0
+        
+        # Pending work, guarded by _condition
+        self._queued: List[ReindexJob] = []
+        self._full_pending = False
+        self._pending_ops: Dict[str, Optional[Dict[str, Any]]] = {}  # doc_id -> document, None = delete
+        
+        self._running: List[ReindexJob] = []
+        self._done = deque(maxlen=history_size or settings.REINDEX_JOB_HISTORY)
+    
+    def start(self):
+        """Start the background worker thread"""
+        with self._condition:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="reindex-worker", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: float = 30.0):
+        """Flush pending work and stop the background worker thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def submit_full(self) -> str:
+        """Queue a full reindex and return its job ID"""
+        job = ReindexJob("full")
+        with self._condition:
+            self._full_pending = True
+            self._pending_ops.clear()
+            self._enqueue(job)
+        return job.id
+    
+    def submit_upsert(self, document: Dict[str, Any]) -> str:
+        """Queue an upsert of a single document and return its job ID"""
+        job = ReindexJob("upsert", document["id"])
+        with self._condition:
+            if not self._full_pending:
+                self._pending_ops[document["id"]] = document
+            self._enqueue(job)
+        return job.id
+    
+    def submit_delete(self, doc_id: str) -> str:
+        """Queue deletion of a single document and return its job ID"""
+        job = ReindexJob("delete", doc_id)
+        with self._condition:
+            if not self._full_pending:
+                self._pending_ops[doc_id] = None
+            self._enqueue(job)
+        return job.id
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Report queued, running and finished jobs
+        
+        Returns:
+            Dictionary with job lists and the debounce window
+        """
+        with self._condition:
+            return {
+                "debounce_seconds": self.debounce_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+                "queued": [job.to_dict() for job in self._queued],
+                "running": [job.to_dict() for job in self._running],
+                "done": [job.to_dict() for job in reversed(self._done)]
+            }
+    
+    def _enqueue(self, job: ReindexJob):
+        """Record a job and wake the worker (caller holds the lock)"""
+        now = time.monotonic()
+        if not self._queued:
+            self._first_submit = now
+        self._queued.append(job)
+        self._last_submit = now
+        self._condition.notify_all()
+    
+    def _run(self):
+        """Worker loop: wait for jobs, debounce, then apply them as one batch"""
+        while True:
+            with self._condition:
+                while not self._queued and not self._stopping:
+                    self._condition.wait()
+                if not self._queued:
+                    return
+                
+                # Keep waiting while edits are still arriving, up to the max wait
+                while not self._stopping:
+                    deadline = min(
+                        self._last_submit + self.debounce_seconds,
+                        self._first_submit + self.max_wait_seconds
+                    )
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                jobs, self._queued = self._queued, []
+                full = self._full_pending
+                ops, self._pending_ops = self._pending_ops, {}
+                self._full_pending = False
+                
+                started = time.time()
+                for job in jobs:
+                    job.status = "running"
+                    job.started_at = started
+                self._running = jobs
+            
+            error = None
+            try:
+                self._apply(full, ops)
+            except Exception as exc:
+                error = str(exc)
+                print(f"⚠️ Knowledge base reindex failed: {exc}")
+            
+            with self._condition:
+                finished = time.time()
+                for job in jobs:
+                    job.status = "failed" if error else "done"
+                    job.error = error
+                    job.finished_at = finished
+                    self._done.append(job)
+                self._running = []
+    
+    def _apply(self, full: bool, ops: Dict[str, Optional[Dict[str, Any]]]):
+        """Apply a merged batch of updates to the knowledge base"""
+        if full:
+            db = SessionLocal()
+            try:
+                reindex_knowledge_base(db)
+            finally:
+                db.close()
+            return
+        
+        for doc_id, document in ops.items():
+            if document is None:
+                knowledge_base.delete_document(doc_id)
+        
+        upserts = [document for document in ops.values() if document is not None]
+        if upserts:
+            knowledge_base.upsert_documents_batch(upserts)
+
+
+# Global instance
+reindex_worker = ReindexWorker()
@@ -1,29 +1,88 @@
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 import json
-from pathlib import Path
+import threading
 from config import settings
+from metrics import ai_stage_duration_seconds
 from .embeddings import embedding_generator
+from .query_cache import LRUCache, normalize_query
+from .vector_store import VectorStore, NumpyVectorStore, create_vector_store
+from .quantization import compression_report
+from .lexical_index import BM25Index
+from .autocomplete import AutocompleteIndex, suggestion_terms
+from .chunker import chunk_documents, collapse_chunks, parent_id
 
 
 class KnowledgeBase:
-    """Vector store for portfolio knowledge base using ChromaDB"""
-    
-    def __init__(self):
-        """Initialize ChromaDB client and collection"""
-        # Create persistent client
-        self.client = chromadb.PersistentClient(
-            path=settings.VECTOR_STORE_PATH,
-            settings=ChromaSettings(anonymized_telemetry=False)
-        )
+    """Portfolio knowledge base on top of a pluggable vector store"""
+    
+    def __init__(self, store: VectorStore = None):
+        """
+        Initialize the knowledge base
         
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name="portfolio_knowledge",
-            metadata={"description": "Personal portfolio knowledge base"}
+        Args:
+            store: Vector store to use; by default the VECTOR_STORE_BACKEND
+                store is opened on first use
+        """
+        self._store = store
+        self._connect_lock = threading.Lock()
+        
+        # BM25 and autocomplete indexes over the same documents; built from
+        # the store on first use, then kept in step with every write
+        self.lexical = BM25Index()
+        self.autocomplete = AutocompleteIndex()
+        self._lexical_ready = False
+        self._lexical_lock = threading.RLock()
+        
+        # Search results cache; the index version invalidates it on every write
+        self._version = 0
+        self._version_lock = threading.Lock()
+        self.search_cache = LRUCache(
+            settings.QUERY_CACHE_MAX_ENTRIES,
+            settings.QUERY_CACHE_MAX_BYTES,
+            settings.QUERY_CACHE_TTL_SECONDS
         )
     
+    @property
+    def store(self) -> VectorStore:
+        """Vector store, opened lazily (ChromaDB and its deps are slow to import)"""
+        if self._store is None:
+            with self._connect_lock:
+                if self._store is None:
+                    self._store = create_vector_store()
+        return self._store
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the vector store has been opened"""
+        return self._store is not None
+    
+    def _ensure_lexical(self):
+        """Build the lexical and autocomplete indexes from the vector store if not done yet"""
+        if self._lexical_ready:
+            return
+        with self._lexical_lock:
+            if self._lexical_ready:
+                return
+            self.lexical.clear()
+            self.autocomplete.clear()
+            for doc in self.store.iter_documents():
+                self.lexical.upsert(doc["id"], doc["text"], doc["metadata"])
+                self.autocomplete.set_source(parent_id(doc["id"]), suggestion_terms(doc["metadata"]))
+            self._lexical_ready = True
+    
+    def _index_lexical(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]):
+        """Mirror written documents into the lexical and autocomplete indexes"""
+        with self._lexical_lock:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                self.lexical.upsert(doc_id, text, metadata)
+                self.autocomplete.set_source(parent_id(doc_id), suggestion_terms(metadata))
+    
+    def _invalidate(self):
+        """Mark the index as changed and drop cached search results"""
+        with self._version_lock:
+            self._version += 1
+            self.search_cache.clear()
+    
     def add_document(self, doc_id: str, text: str, metadata: Dict[str, Any]):
         """
         Add a document to the knowledge base
@@ -33,71 +92,158 @@ class KnowledgeBase:
             text: Document text content
             metadata: Document metadata (type, title, etc.)
         """
-        # Generate embedding
-        embedding = embedding_generator.generate(text)
-        
-        # Add to collection
-        self.collection.add(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[text],
-            metadatas=[metadata]
-        )
+        self.add_documents_batch([{"id": doc_id, "text": text, "metadata": metadata}])
     
-    def add_documents_batch(self, documents: List[Dict[str, Any]]):
+    def add_documents_batch(self, documents: Iterable[Dict[str, Any]]):
         """
         Add multiple documents to the knowledge base
         
         Args:
-            documents: List of dicts with 'id', 'text', and 'metadata' keys
+            documents: Dicts with 'id', 'text', and 'metadata' keys; may be
+                a generator, which is consumed one document at a time
+        """
+        self._write(documents, replace=False)
+    
+    def upsert_document(self, doc_id: str, text: str, metadata: Dict[str, Any]):
         """
-        ids = [doc["id"] for doc in documents]
-        texts = [doc["text"] for doc in documents]
-        metadatas = [doc["metadata"] for doc in documents]
+        Insert or replace a single document in the knowledge base
+        
+        Args:
+            doc_id: Unique document identifier (e.g. 'project_3')
+            text: Document text content
+            metadata: Document metadata (type, title, etc.)
+        """
+        self.upsert_documents_batch([{"id": doc_id, "text": text, "metadata": metadata}])
+    
+    def upsert_documents_batch(self, documents: Iterable[Dict[str, Any]]):
+        """
+        Insert or replace multiple documents in the knowledge base
+        
+        Args:
+            documents: Dicts with 'id', 'text', and 'metadata' keys
+        """
+        self._write(documents, replace=True)
+    
+    def _write(self, documents: Iterable[Dict[str, Any]], replace: bool):
+        """
+        Chunk, embed and store documents in bounded batches
+        
+        Long texts are split into overlapping chunks (see ai.chunker), and at
+        most INDEX_BATCH_SIZE chunks are embedded and written at a time, so
+        indexing long content never holds every embedding in memory.
+        
+        Args:
+            documents: Dicts with 'id', 'text', and 'metadata' keys
+            replace: Upsert, then drop chunks left from older versions
+        """
+        chunk_counts: Dict[str, int] = {}
+        batch: List[Dict[str, Any]] = []
+        with self.store.bulk_write():
+            for chunk in chunk_documents(documents, settings.CHUNK_MAX_WORDS, settings.CHUNK_OVERLAP_WORDS):
+                chunk_counts[chunk["metadata"]["parent_id"]] = chunk["metadata"]["chunks"]
+                batch.append(chunk)
+                if len(batch) >= settings.INDEX_BATCH_SIZE:
+                    self._write_batch(batch, replace)
+                    batch = []
+            if batch:
+                self._write_batch(batch, replace)
+            
+            if replace and chunk_counts:
+                # A parent whose chunk count changed leaves chunks with the old count;
+                # a parent that became chunked leaves its old unchunked document
+                stale = [
+                    {"$and": [{"parent_id": doc_id}, {"chunks": {"$ne": count}}]}
+                    for doc_id, count in chunk_counts.items()
+                ]
+                where = stale[0] if len(stale) == 1 else {"$or": stale}
+                unchunked = [doc_id for doc_id, count in chunk_counts.items() if count > 1]
+                self.store.delete(ids=unchunked, where=where)
+                with self._lexical_lock:
+                    self.lexical.delete_where(where)
+                    for doc_id in unchunked:
+                        self.lexical.delete(doc_id)
         
-        # Generate embeddings in batch
+        if chunk_counts:
+            self._invalidate()
+    
+    def _write_batch(self, chunks: List[Dict[str, Any]], replace: bool):
+        """Embed one batch of chunks and write it to the store and text indexes"""
+        ids = [chunk["id"] for chunk in chunks]
+        texts = [chunk["text"] for chunk in chunks]
+        metadatas = [chunk["metadata"] for chunk in chunks]
+        
+        # Generate embeddings in batch; only cache misses reach the model
         embeddings = embedding_generator.generate_batch(texts)
         
-        # Add to collection
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=texts,
-            metadatas=metadatas
-        )
+        if replace:
+            self.store.upsert(ids, embeddings, texts, metadatas)
+        else:
+            self.store.add(ids, embeddings, texts, metadatas)
+        self._index_lexical(ids, texts, metadatas)
     
-    def search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, n_results: int = 5, where: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Search the knowledge base for relevant documents
         
         Args:
             query: Search query text
             n_results: Number of results to return
+            where: Optional metadata filter, applied inside the vector query
+                so top-k is computed over matching documents only
             
         Returns:
             List of relevant documents with metadata and scores
         """
+        cache_key = (normalize_query(query), n_results, json.dumps(where, sort_keys=True) if where else None)
+        version = self._version
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         # Generate query embedding
         query_embedding = embedding_generator.generate(query)
         
-        # Search collection
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results
-        )
+        # Search vector store; over-fetch so each document keeps its best chunk
+        with ai_stage_duration_seconds.time(stage="vector_query"):
+            chunk_results = self.store.query(query_embedding, n_results * settings.SEARCH_CHUNK_OVERFETCH, where=where)
+        formatted_results = collapse_chunks(chunk_results, n_results)
+        
+        # Don't cache results computed against an index that changed meanwhile
+        with self._version_lock:
+            if version == self._version:
+                self.search_cache.set(cache_key, formatted_results)
+        
+        return list(formatted_results)
+    
+    def lexical_search(self, query: str, n_results: int = 5, where: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Search the knowledge base with BM25 only (no embedding model call)
         
-        # Format results
-        formatted_results = []
-        if results["ids"] and len(results["ids"]) > 0:
-            for i in range(len(results["ids"][0])):
-                formatted_results.append({
-                    "id": results["ids"][0][i],
-                    "text": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i] if "distances" in results else None
-                })
+        Args:
+            query: Search query text
+            n_results: Number of results to return
+            where: Optional metadata filter
+            
+        Returns:
+            List of documents with metadata and BM25 scores
+        """
+        self._ensure_lexical()
+        results = self.lexical.search(query, n_results * settings.SEARCH_CHUNK_OVERFETCH, where=where)
+        return collapse_chunks(results, n_results)
+    
+    def suggest(self, prefix: str, limit: int = 5) -> List[str]:
+        """
+        Autocomplete a partial query from indexed titles, tags and names
         
-        return formatted_results
+        Args:
+            prefix: Partial query
+            limit: Maximum number of suggestions
+            
+        Returns:
+            List of suggested terms, most popular first
+        """
+        self._ensure_lexical()
+        return self.autocomplete.suggest(prefix, limit)
     
     def delete_by_type(self, doc_type: str):
         """
@@ -106,31 +252,60 @@ class KnowledgeBase:
         Args:
             doc_type: Document type (e.g., 'project', 'skill', 'blog')
         """
-        # Get all documents of this type
-        results = self.collection.get(
-            where={"type": doc_type}
-        )
-        
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
+        self.store.delete(where={"type": doc_type})
+        with self._lexical_lock:
+            for doc_id in self.lexical.delete_where({"type": doc_type}):
+                self.autocomplete.remove_source(parent_id(doc_id))
+        self._invalidate()
     
     def delete_document(self, doc_id: str):
         """
-        Delete a specific document
+        Delete a specific document and all of its chunks
         
         Args:
             doc_id: Document identifier
         """
-        self.collection.delete(ids=[doc_id])
+        self.store.delete(ids=[doc_id], where={"parent_id": doc_id})
+        with self._lexical_lock:
+            self.lexical.delete(doc_id)
+            self.lexical.delete_where({"parent_id": doc_id})
+            self.autocomplete.remove_source(doc_id)
+        self._invalidate()
+    
+    def bulk_write(self):
+        """Context manager grouping several writes so the store persists once"""
+        return self.store.bulk_write()
     
     def clear_all(self):
         """Clear all documents from the knowledge base"""
-        # Delete and recreate collection
-        self.client.delete_collection("portfolio_knowledge")
-        self.collection = self.client.get_or_create_collection(
-            name="portfolio_knowledge",
-            metadata={"description": "Personal portfolio knowledge base"}
+        self.store.clear()
+        with self._lexical_lock:
+            self.lexical.clear()
+            self.autocomplete.clear()
+            self._lexical_ready = True
+        self._invalidate()
+    
+    def compression_report(self, k: int = 10) -> Dict[str, Any]:
+        """
+        Report recall@k against memory for each compact vector setting
+        
+        Args:
+            k: Result count to evaluate
+            
+        Returns:
+            Dictionary with one row per quantization/dimension setting
+        """
+        report = compression_report(
+            self.store.get_embeddings(),
+            k=k,
+            rerank_factor=settings.VECTOR_RERANK_FACTOR or 1
         )
+        report["current"] = {
+            "quantization": settings.VECTOR_QUANTIZATION,
+            "dimension": settings.VECTOR_REDUCED_DIMENSION or None,
+            "reduction": settings.VECTOR_REDUCTION
+        }
+        return report
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -139,11 +314,23 @@ class KnowledgeBase:
         Returns:
             Dictionary with collection statistics
         """
-        count = self.collection.count()
-        return {
+        count = self.store.count()
+        stats = {
             "total_documents": count,
-            "collection_name": self.collection.name
+            "collection_name": self.store.name,
+            "backend": type(self.store).__name__
         }
+        if isinstance(self.store, NumpyVectorStore) and self.store.codec is not None:
+            stats["vector_codec"] = self.store.codec.describe()
+        stats["query_embedding_cache"] = embedding_generator.query_cache.get_stats()
+        stats["search_cache"] = self.search_cache.get_stats()
+        stats["lexical_index"] = self.lexical.get_stats()
+        stats["autocomplete_index"] = self.autocomplete.get_stats()
+        if embedding_generator.batcher is not None:
+            stats["query_batcher"] = embedding_generator.batcher.get_stats()
+        if embedding_generator.cache is not None:
+            stats["embedding_cache"] = embedding_generator.cache.get_stats()
+        return stats
 
 
 # Global instance
@@ -0,0 +1,172 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import List, Dict, Any, Optional
+from .vector_store import matches_filter
+
+# Keeps tech names intact: "c++", "c#", "node.js", "next.js", "scikit-learn"
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were with".split()
+)
+
+
+def normalize_term(token: str) -> str:
+    """Fold simple plurals ("projects" -> "project") of plain words"""
+    if len(token) > 3 and token.isalpha() and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms"""
+    return [
+        normalize_term(token)
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """
+    In-process inverted index with Okapi BM25 scoring
+    
+    Holds the same documents as the vector store (keyed by document ID) so
+    exact terms such as framework or skill names can be matched without
+    running the embedding model.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {doc_id: term frequency}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}  # doc_id -> distinct terms, for deletes
+        self._texts: Dict[str, str] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+    
+    def upsert(self, doc_id: str, text: str, metadata: Dict[str, Any]):
+        """Index a document, replacing any previous version"""
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._terms[doc_id] = list(counts)
+            self._lengths[doc_id] = len(tokens)
+            self._texts[doc_id] = text
+            self._metadatas[doc_id] = metadata
+            self._total_length += len(tokens)
+    
+    def delete(self, doc_id: str):
+        """Remove a document if present"""
+        with self._lock:
+            self._remove(doc_id)
+    
+    def delete_where(self, where: Dict[str, Any]) -> List[str]:
+        """Remove every document whose metadata matches the filter; returns their IDs"""
+        with self._lock:
+            doc_ids = [d for d, metadata in self._metadatas.items() if matches_filter(metadata, where)]
+            for doc_id in doc_ids:
+                self._remove(doc_id)
+            return doc_ids
+    
+    def _remove(self, doc_id: str):
+        """Remove a document (caller holds the lock)"""
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._texts[doc_id]
+        del self._metadatas[doc_id]
+    
+    def clear(self):
+        """Remove every document"""
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._terms.clear()
+            self._texts.clear()
+            self._metadatas.clear()
+            self._total_length = 0
+    
+    def count(self) -> int:
+        """Number of indexed documents"""
+        return len(self._lengths)
+    
+    def search(self, query: str, n_results: int = 10, where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Rank documents by BM25 score
+        
+        Args:
+            query: Search query text
+            n_results: Number of results to return
+            where: Optional metadata filter (vector store syntax)
+        
+        Returns:
+            List of documents with 'id', 'text', 'metadata' and 'score'
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._lengths)
+            if not terms or n_docs == 0:
+                return []
+            avg_length = self._total_length / n_docs
+            
+            scores: Dict[str, float] = {}
+            allowed: Dict[str, bool] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    if where:
+                        if doc_id not in allowed:
+                            allowed[doc_id] = matches_filter(self._metadatas[doc_id], where)
+                        if not allowed[doc_id]:
+                            continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            
+            top = heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+            return [
+                {
+                    "id": doc_id,
+                    "text": self._texts[doc_id],
+                    "metadata": self._metadatas[doc_id],
+                    "score": score
+                }
+                for doc_id, score in top
+            ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+        
+        Returns:
+            Dictionary with document and term counts
+        """
+        with self._lock:
+            return {
+                "documents": len(self._lengths),
+                "terms": len(self._postings),
+                "avg_document_length": self._total_length / len(self._lengths) if self._lengths else 0.0
+            }
@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item calls into one batched call
+    
+    Callers block in submit() while a dedicated thread collects requests
+    that arrive within max_wait_ms (up to max_batch_size), runs the batch
+    function once, and hands each caller its own result.
+    """
+    
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        name: str = "micro-batcher"
+    ):
+        """
+        Args:
+            batch_fn: Function mapping a list of inputs to a list of outputs
+            max_batch_size: Maximum number of inputs per batch
+            max_wait_ms: How long to wait for more inputs after the first one
+            name: Worker thread name
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.max_seen_batch = 0
+    
+    def submit(self, item: str) -> Any:
+        """
+        Add an input to the next batch and wait for its result
+        
+        Args:
+            item: Single input
+        
+        Returns:
+            The batch function's output for this input
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result()
+    
+    def _ensure_started(self):
+        """Start the worker thread on first use"""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+    
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """Block for the first request, then gather more until the batch closes"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        """Worker loop"""
+        while True:
+            batch = self._collect()
+            
+            # Identical inputs in one batch are computed once
+            unique = list(dict.fromkeys(item for item, _ in batch))
+            try:
+                results = self.batch_fn(unique)
+                if len(results) != len(unique):
+                    raise RuntimeError(
+                        f"{self.name}: batch function returned {len(results)} results for {len(unique)} inputs"
+                    )
+                outputs = dict(zip(unique, results))
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            
+            for item, future in batch:
+                future.set_result(outputs[item])
+            
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.max_seen_batch = max(self.max_seen_batch, len(batch))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics
+        
+        Returns:
+            Dictionary with batch counts and sizes
+        """
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+                "max_seen_batch": self.max_seen_batch
+            }
@@ -0,0 +1,205 @@
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+# Rows scored per chunk so int8/float16 codes are never upcast all at once
+SCORE_CHUNK_ROWS = 4096
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of matrix with unit-length rows"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    k = min(k, scores.shape[0])
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class VectorCodec:
+    """
+    Compact representation of embedding vectors
+    
+    Vectors are optionally reduced to `dimension` components (by truncation
+    or PCA), re-normalized, then stored as float32, float16 or int8 with a
+    per-vector scale. Scores are approximate cosine similarities.
+    """
+    
+    QUANTIZATIONS = ("none", "float16", "int8")
+    REDUCTIONS = ("truncate", "pca")
+    
+    def __init__(self, quantization: str = "none", dimension: int = 0, reduction: str = "pca"):
+        """
+        Args:
+            quantization: "none" (float32), "float16" or "int8"
+            dimension: Reduced dimension, or 0 to keep the full dimension
+            reduction: "truncate" or "pca"
+        """
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantization}")
+        if reduction not in self.REDUCTIONS:
+            raise ValueError(f"Unknown reduction: {reduction}")
+        self.quantization = quantization
+        self.dimension = dimension
+        self.reduction = reduction
+        self.dtype = {"none": np.float32, "float16": np.float16, "int8": np.int8}[quantization]
+        self._mean: Optional[np.ndarray] = None
+        self._components: Optional[np.ndarray] = None
+        self.fitted = False
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the codec changes the stored representation at all"""
+        return self.quantization != "none" or self.dimension > 0
+    
+    def fit(self, matrix: np.ndarray):
+        """
+        Fit the dimension reduction on a sample of vectors
+        
+        PCA needs at least `dimension` samples; with fewer, the codec falls
+        back to truncation and stays unfitted, so it is refit once enough
+        vectors exist.
+        """
+        self._mean = None
+        self._components = None
+        uses_pca = self.reduction == "pca" and 0 < self.dimension < matrix.shape[1]
+        if uses_pca and matrix.shape[0] >= self.dimension:
+            mean = matrix.mean(axis=0)
+            _, _, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+            self._mean = mean.astype(np.float32)
+            self._components = vt[:self.dimension].T.astype(np.float32)
+        self.fitted = not uses_pca or self._components is not None
+    
+    def reset(self):
+        """Forget the fitted projection (e.g. after the store is cleared)"""
+        self._mean = None
+        self._components = None
+        self.fitted = False
+    
+    def project(self, matrix: np.ndarray) -> np.ndarray:
+        """Reduce and re-normalize vectors"""
+        if self._components is not None:
+            matrix = (matrix - self._mean) @ self._components
+        elif 0 < self.dimension < matrix.shape[1]:
+            matrix = matrix[:, :self.dimension]
+        return normalize_rows(matrix)
+    
+    def encode(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode unit vectors into compact codes
+        
+        Returns:
+            (codes, scales) where vector ~= codes * scale
+        """
+        projected = self.project(matrix)
+        if self.quantization == "int8":
+            scales = np.abs(projected).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.round(projected / scales[:, None]).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        return projected.astype(self.dtype), np.ones(projected.shape[0], dtype=np.float32)
+    
+    def scores(self, codes: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Approximate similarity of each code to a unit query vector
+        
+        Args:
+            codes: Encoded vectors
+            scales: Per-vector scales from encode()
+            query: Full-dimension unit query vector
+        """
+        projected = self.project(query[None, :])[0]
+        out = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], SCORE_CHUNK_ROWS):
+            chunk = codes[start:start + SCORE_CHUNK_ROWS].astype(np.float32)
+            out[start:start + SCORE_CHUNK_ROWS] = chunk @ projected
+        return out * scales
+    
+    def bytes_per_vector(self, full_dimension: int) -> int:
+        """Memory used by one encoded vector, including its scale"""
+        dimension = self.dimension if 0 < self.dimension < full_dimension else full_dimension
+        scale_bytes = 4 if self.quantization == "int8" else 0
+        return dimension * np.dtype(self.dtype).itemsize + scale_bytes
+    
+    def describe(self) -> Dict[str, Any]:
+        """Settings summary for stats and reports"""
+        return {
+            "quantization": self.quantization,
+            "dimension": self.dimension or None,
+            "reduction": self.reduction if self.dimension else None
+        }
+
+
+def compression_report(
+    vectors: np.ndarray,
+    k: int = 10,
+    n_queries: int = 200,
+    rerank_factor: int = 4,
+    dimensions: Optional[List[int]] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Measure recall@k against memory for each codec setting
+    
+    Queries are stored vectors perturbed with noise, so the report reflects
+    this deployment's own embedding distribution. Recall is the overlap of
+    the approximate and exact top-k, without and with full-precision
+    rescoring of the top k * rerank_factor candidates.
+    
+    Args:
+        vectors: Full-precision embedding matrix (one row per document)
+        k: Result count to evaluate
+        n_queries: Number of sampled queries
+        rerank_factor: Candidate multiplier for rescoring
+        dimensions: Reduced dimensions to try (default: full, 1/2, 1/4)
+        seed: Random seed for query sampling
+    
+    Returns:
+        Dictionary with the corpus size and one row per setting
+    """
+    vectors = normalize_rows(vectors)
+    n, full_dimension = vectors.shape
+    if n == 0:
+        return {"documents": 0, "k": k, "settings": []}
+    
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.integers(0, n, size=n_queries)]
+    queries = normalize_rows(sample + rng.normal(scale=0.05, size=sample.shape))
+    exact = [set(top_k(vectors @ q, k).tolist()) for q in queries]
+    k_eff = min(k, n)
+    
+    if dimensions is None:
+        dimensions = [0, full_dimension // 2, full_dimension // 4]
+    
+    rows = []
+    for dimension in dimensions:
+        for quantization in VectorCodec.QUANTIZATIONS:
+            codec = VectorCodec(quantization, dimension, "pca")
+            codec.fit(vectors)
+            codes, scales = codec.encode(vectors)
+            
+            hits = hits_rerank = 0
+            for q, truth in zip(queries, exact):
+                approx = codec.scores(codes, scales, q)
+                hits += len(truth & set(top_k(approx, k).tolist()))
+                candidates = top_k(approx, k * rerank_factor)
+                rescored = candidates[top_k(vectors[candidates] @ q, k)]
+                hits_rerank += len(truth & set(rescored.tolist()))
+            
+            per_vector = codec.bytes_per_vector(full_dimension)
+            rows.append({
+                **codec.describe(),
+                "bytes_per_vector": per_vector,
+                "total_mb": round(per_vector * n / 1024 / 1024, 3),
+                "compression": round(full_dimension * 4 / per_vector, 2),
+                "recall_at_k": round(hits / (len(queries) * k_eff), 4),
+                "recall_at_k_rerank": round(hits_rerank / (len(queries) * k_eff), 4)
+            })
+    
+    return {"documents": n, "dimension": full_dimension, "k": k, "rerank_factor": rerank_factor, "settings": rows}
@@ -0,0 +1,116 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Roughly estimate the in-memory size of a cached value in bytes
+    
+    Walks lists, tuples and dicts (the shapes used for embeddings and
+    search results) and adds up sys.getsizeof of the leaves.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache bounded by entry count, memory and TTL"""
+    
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        sizer: Callable[[Any], int] = estimate_size
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached entries
+            max_bytes: Maximum estimated memory used by cached values
+            ttl_seconds: Lifetime of an entry; 0 disables expiry
+            sizer: Function estimating a value's size in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizer = sizer
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] and entry[2] < time.monotonic():
+                self._remove(key)
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, key: Hashable, value: Any):
+        """Cache value under key, evicting least recently used entries as needed"""
+        size = self._sizer(value)
+        if size > self.max_bytes:
+            return
+        
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+    
+    def clear(self):
+        """Drop every entry (hit/miss counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def _remove(self, key: Hashable):
+        """Remove an entry (caller holds the lock)"""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with occupancy, limits and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different queries share a cache entry"""
+    return " ".join(query.split())
@@ -1,27 +1,70 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from config import settings
 from .knowledge_base import knowledge_base
+from .lexical_index import tokenize
+
+SEARCH_MODES = ("auto", "vector", "lexical", "hybrid")
+
+# Metadata keys clients may filter on (see SearchFilters in routes/ai.py)
+FILTER_KEYS = ("type", "category", "organization", "tags", "tech_stack")
 
 
 class SearchHandler:
     """Handle AI-powered search functionality"""
     
-    def search(self, query: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        filters: Dict[str, Any] = None,
+        limit: int = 10,
+        offset: int = 0,
+        mode: str = None
+    ) -> List[Dict[str, Any]]:
         """
         Perform AI-powered semantic search
         
         Args:
             query: Search query text
             filters: Optional filters (type, tags, etc.)
+            limit: Maximum number of results to return
+            offset: Number of leading results to skip (for paging)
+            mode: "vector", "lexical" (BM25 only), "hybrid" (fused), or
+                "auto" (lexical fast path for short keyword queries that
+                match enough documents, hybrid otherwise)
             
         Returns:
             List of search results with relevance scores
         """
-        # Perform vector search
-        results = knowledge_base.search(query, n_results=10)
+        mode = mode or settings.SEARCH_DEFAULT_MODE
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        
+        # Filters go into the index queries, so top-k only ranks matching documents
+        where = self._build_where(filters) if filters else None
+        n_results = offset + limit
         
-        # Apply filters if provided
-        if filters:
-            results = self._apply_filters(results, filters)
+        results = None
+        lexical = None
+        if mode == "lexical":
+            results = self._lexical_results(query, n_results, where)
+        elif mode == "auto":
+            # Fetched at the hybrid candidate depth, so a hybrid fallback reuses it
+            lexical = self._lexical_results(query, self._candidates(n_results), where)
+            is_keyword_query = len(tokenize(query)) <= settings.SEARCH_KEYWORD_MAX_TERMS
+            if is_keyword_query and len(lexical) >= n_results:
+                # Skips the embedding model entirely
+                results = lexical[:n_results]
+        
+        if results is None:
+            if mode == "vector":
+                results = self._vector_results(query, n_results, where)
+            else:
+                results = self._hybrid_results(query, n_results, where, lexical)
+        
+        results = results[offset:offset + limit]
+        if results:
+            # Searches that find something make the term rank higher as a suggestion
+            knowledge_base.autocomplete.record_search(query)
         
         # Format results for frontend
         formatted_results = []
@@ -31,37 +74,107 @@ class SearchHandler:
                 "type": result["metadata"].get("type"),
                 "title": result["metadata"].get("title", "Untitled"),
                 "excerpt": result["text"][:200] + "..." if len(result["text"]) > 200 else result["text"],
-                "relevance": 1 - (result["distance"] or 0),  # Convert distance to similarity
+                "relevance": result["score"],
                 "metadata": result["metadata"]
             })
         
         return formatted_results
     
-    def _apply_filters(self, results: List[Dict], filters: Dict[str, Any]) -> List[Dict]:
+    def _vector_results(self, query: str, n_results: int, where: Dict[str, Any]) -> List[Dict]:
+        """Embedding search; score is similarity (1 - distance)"""
+        results = knowledge_base.search(query, n_results=n_results, where=where)
+        return [{**result, "score": 1 - (result["distance"] or 0)} for result in results]
+    
+    def _lexical_results(self, query: str, n_results: int, where: Dict[str, Any]) -> List[Dict]:
+        """BM25 search; score is normalized so the best match is 1.0"""
+        results = knowledge_base.lexical_search(query, n_results=n_results, where=where)
+        if not results:
+            return []
+        top_score = results[0]["score"] or 1.0
+        return [{**result, "score": result["score"] / top_score} for result in results]
+    
+    @staticmethod
+    def _candidates(n_results: int) -> int:
+        """Results fetched from each ranking before hybrid fusion"""
+        return n_results * 2
+    
+    def _hybrid_results(
+        self,
+        query: str,
+        n_results: int,
+        where: Dict[str, Any],
+        lexical: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        Fuse vector and BM25 rankings
+        
+        Each list is over-fetched, scores are min-max normalized per list, and
+        the fused score is alpha * vector + (1 - alpha) * lexical, with a
+        document missing from one list scoring 0 there. `lexical` reuses
+        BM25 results already fetched at _candidates(n_results) depth.
+        """
+        candidates = self._candidates(n_results)
+        vector = self._vector_results(query, candidates, where)
+        if lexical is None:
+            lexical = self._lexical_results(query, candidates, where)
+        alpha = settings.SEARCH_HYBRID_ALPHA
+        
+        fused: Dict[str, Dict[str, Any]] = {}
+        for weight, results in ((alpha, self._min_max(vector)), (1 - alpha, lexical)):
+            for result in results:
+                entry = fused.setdefault(result["id"], {**result, "score": 0.0})
+                entry["score"] += weight * result["score"]
+        
+        ranked = sorted(fused.values(), key=lambda result: result["score"], reverse=True)
+        return ranked[:n_results]
+    
+    def _min_max(self, results: List[Dict]) -> List[Dict]:
+        """Rescale scores to [0, 1] within a result list"""
+        if not results:
+            return []
+        scores = [result["score"] for result in results]
+        low, high = min(scores), max(scores)
+        span = high - low
+        return [
+            {**result, "score": (result["score"] - low) / span if span else 1.0}
+            for result in results
+        ]
+    
+    def _build_where(self, filters: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Apply filters to search results
+        Translate search filters into a vector store `where` clause
         
         Args:
-            results: Search results
-            filters: Filter criteria
+            filters: Filter criteria; 'tags' matches any of the given tags,
+                every other key must equal its value (or one of a list)
             
         Returns:
-            Filtered results
-        """
-        filtered = results
-        
-        # Filter by type
-        if "type" in filters and filters["type"]:
-            filtered = [r for r in filtered if r["metadata"].get("type") == filters["type"]]
+            Filter in the vector store's `where` syntax, or None
         
-        # Filter by tags
-        if "tags" in filters and filters["tags"]:
-            filtered = [
-                r for r in filtered 
-                if any(tag in r["metadata"].get("tags", []) for tag in filters["tags"])
-            ]
+        Raises:
+            ValueError: For keys outside FILTER_KEYS or values that are not
+                a string/number or a list of them (e.g. operator objects)
+        """
+        clauses = []
+        for key, value in filters.items():
+            if key not in FILTER_KEYS:
+                raise ValueError(f"Unknown search filter: {key}")
+            if value is None or value == [] or value == "":
+                continue
+            scalars = value if isinstance(value, list) else [value]
+            if not all(isinstance(item, (str, int, float)) for item in scalars):
+                raise ValueError(f"Search filter '{key}' must be a value or a list of values")
+            if key == "tags":
+                tags = value if isinstance(value, list) else [value]
+                clauses.append({"tags": {"$in": tags}})
+            elif isinstance(value, list):
+                clauses.append({key: {"$in": value}})
+            else:
+                clauses.append({key: value})
         
-        return filtered
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
     
     def suggest(self, partial_query: str, limit: int = 5) -> List[str]:
         """
@@ -74,30 +187,9 @@ class SearchHandler:
         Returns:
             List of suggested queries
         """
-        # Simple implementation - in production, use a more sophisticated approach
-        suggestions = []
-        
-        query_lower = partial_query.lower()
-        
-        # Common portfolio-related suggestions
-        all_suggestions = [
-            "projects",
-            "skills and technologies",
-            "work experience",
-            "education",
-            "blog posts",
-            "contact information",
-            "resume",
-            "certifications",
-            "achievements"
-        ]
-        
-        # Filter suggestions that match partial query
-        for suggestion in all_suggestions:
-            if query_lower in suggestion or suggestion.startswith(query_lower):
-                suggestions.append(suggestion)
-        
-        return suggestions[:limit]
+        # Prefix trie over project titles, tags, tech stacks, skill names,
+        # organizations and blog titles, kept in step with the knowledge base
+        return knowledge_base.suggest(partial_query, limit=limit)
 
 
 # Global instance
@@ -0,0 +1,570 @@
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional
+import numpy as np
+from config import settings
+from .quantization import VectorCodec, normalize_rows, top_k
+
+# Number of IDs fetched per page when deleting documents by filter
+DELETE_PAGE_SIZE = 500
+
+COLLECTION_NAME = "portfolio_knowledge"
+
+
+class VectorStore(ABC):
+    """
+    Storage backend for document embeddings
+    
+    Filters use the ChromaDB `where` syntax: {"type": "blog"},
+    {"type": {"$in": [...]}}, and {"$and": [...]} / {"$or": [...]}.
+    Query results are dicts with 'id', 'text', 'metadata' and 'distance'.
+    """
+    
+    name: str = COLLECTION_NAME
+    
+    @abstractmethod
+    def add(self, ids: List[str], embeddings: List[List[float]], texts: List[str],
+            metadatas: List[Dict[str, Any]]):
+        """Add new documents"""
+    
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings: List[List[float]], texts: List[str],
+               metadatas: List[Dict[str, Any]]):
+        """Insert or replace documents"""
+    
+    @abstractmethod
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None):
+        """Delete documents by ID or by metadata filter"""
+    
+    @abstractmethod
+    def query(self, embedding: List[float], n_results: int,
+              where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Return the n_results nearest documents matching the filter"""
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored documents"""
+    
+    @abstractmethod
+    def clear(self):
+        """Remove every document"""
+    
+    def get_embeddings(self) -> np.ndarray:
+        """Return every stored embedding as a float32 matrix (for reports)"""
+        raise NotImplementedError
+    
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored document as a dict with 'id', 'text' and 'metadata'"""
+        raise NotImplementedError
+    
+    @contextmanager
+    def bulk_write(self):
+        """Group several writes; stores that persist explicitly save once at the end"""
+        yield
+
+
+# Separator for the per-element flags ChromaDB uses to index list metadata
+LIST_FLAG_SEPARATOR = "::"
+
+
+def encode_chroma_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert metadata to what ChromaDB accepts (str/int/float/bool values)
+    
+    None values are dropped. A list value is stored as a JSON string plus one
+    `key::element` = True flag per element, so list membership can be
+    filtered inside the query.
+    """
+    encoded = {}
+    lists = []
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        if isinstance(value, list):
+            lists.append(key)
+            encoded[key] = json.dumps(value)
+            for element in value:
+                encoded[f"{key}{LIST_FLAG_SEPARATOR}{element}"] = True
+        else:
+            encoded[key] = value
+    if lists:
+        encoded["__lists"] = ",".join(lists)
+    return encoded
+
+
+def decode_chroma_metadata(encoded: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverse encode_chroma_metadata"""
+    lists = set(encoded.get("__lists", "").split(",")) - {""}
+    metadata = {}
+    for key, value in encoded.items():
+        if key == "__lists" or LIST_FLAG_SEPARATOR in key:
+            continue
+        metadata[key] = json.loads(value) if key in lists else value
+    return metadata
+
+
+def encode_chroma_where(where: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate a filter so $eq/$in also match elements of list metadata
+    
+    {"tags": {"$in": ["AI"]}} becomes
+    {"$or": [{"tags": {"$in": ["AI"]}}, {"tags::AI": True}]}.
+    """
+    clauses = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            clauses.append({key: [encode_chroma_where(clause) for clause in condition]})
+            continue
+        
+        op, operand = next(iter(condition.items())) if isinstance(condition, dict) else ("$eq", condition)
+        if op in ("$eq", "$in"):
+            values = operand if op == "$in" else [operand]
+            flags = [{f"{key}{LIST_FLAG_SEPARATOR}{value}": True} for value in values if isinstance(value, str)]
+            clauses.append({"$or": [{key: {op: operand}}, *flags]} if flags else {key: {op: operand}})
+        else:
+            clauses.append({key: condition})
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a persistent ChromaDB collection"""
+    
+    def __init__(self, path: str):
+        """Open (or create) the persistent ChromaDB collection"""
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+        
+        self.client = chromadb.PersistentClient(
+            path=path,
+            settings=ChromaSettings(anonymized_telemetry=False)
+        )
+        self.collection = self._get_collection()
+    
+    def _get_collection(self):
+        """Get or create the portfolio collection"""
+        return self.client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata={"description": "Personal portfolio knowledge base"}
+        )
+    
+    def add(self, ids, embeddings, texts, metadatas):
+        metadatas = [encode_chroma_metadata(metadata) for metadata in metadatas]
+        self.collection.add(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+    
+    def upsert(self, ids, embeddings, texts, metadatas):
+        metadatas = [encode_chroma_metadata(metadata) for metadata in metadatas]
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+    
+    def delete(self, ids=None, where=None):
+        if ids:
+            self.collection.delete(ids=ids)
+        if where is None:
+            return
+        where = encode_chroma_where(where)
+        
+        # Page through matching IDs so large collections are never loaded at once.
+        # Deleted IDs drop out of the result set, so every page starts at offset 0.
+        while True:
+            results = self.collection.get(where=where, limit=DELETE_PAGE_SIZE, include=[])
+            if not results["ids"]:
+                break
+            self.collection.delete(ids=results["ids"])
+    
+    def query(self, embedding, n_results, where=None):
+        kwargs = {"where": encode_chroma_where(where)} if where else {}
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=n_results,
+            **kwargs
+        )
+        
+        formatted_results = []
+        if results["ids"] and len(results["ids"]) > 0:
+            for i in range(len(results["ids"][0])):
+                formatted_results.append({
+                    "id": results["ids"][0][i],
+                    "text": results["documents"][0][i],
+                    "metadata": decode_chroma_metadata(results["metadatas"][0][i]),
+                    "distance": results["distances"][0][i] if "distances" in results else None
+                })
+        return formatted_results
+    
+    def count(self):
+        return self.collection.count()
+    
+    def get_embeddings(self):
+        embeddings = []
+        offset = 0
+        while True:
+            results = self.collection.get(limit=DELETE_PAGE_SIZE, offset=offset, include=["embeddings"])
+            if not results["ids"]:
+                break
+            embeddings.extend(results["embeddings"])
+            offset += len(results["ids"])
+        return np.asarray(embeddings, dtype=np.float32).reshape(-1, settings.EMBEDDING_DIMENSION)
+    
+    def iter_documents(self):
+        offset = 0
+        while True:
+            results = self.collection.get(
+                limit=DELETE_PAGE_SIZE,
+                offset=offset,
+                include=["documents", "metadatas"]
+            )
+            if not results["ids"]:
+                break
+            for doc_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"]):
+                yield {"id": doc_id, "text": text, "metadata": decode_chroma_metadata(metadata)}
+            offset += len(results["ids"])
+    
+    def clear(self):
+        # Delete and recreate collection
+        self.client.delete_collection(COLLECTION_NAME)
+        self.collection = self._get_collection()
+
+
+def matches_filter(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a ChromaDB-style `where` filter against one metadata dict
+    
+    List-valued metadata (e.g. tags) matches when any element matches.
+    """
+    if not where:
+        return True
+    
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+        
+        value = metadata.get(key)
+        values = value if isinstance(value, list) else [value]
+        op, operand = next(iter(condition.items())) if isinstance(condition, dict) else ("$eq", condition)
+        
+        if op == "$eq":
+            ok = operand in values
+        elif op == "$ne":
+            ok = operand not in values
+        elif op == "$in":
+            ok = any(v in operand for v in values)
+        elif op == "$nin":
+            ok = not any(v in operand for v in values)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        
+        if not ok:
+            return False
+    return True
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector store using a contiguous float32 matrix
+    
+    Vectors are L2-normalized on insert so cosine similarity is a single
+    matrix-vector product; top-k uses argpartition. Distances are cosine
+    distances (1 - similarity). With a path, the matrix and documents are
+    saved after each write (once at the end of a bulk_write() block) and
+    reloaded on startup, optionally memory-mapped.
+    
+    With a codec, search scans compact (reduced and/or quantized) codes and
+    rescores the top k * rerank_factor candidates with the full-precision
+    vectors. When persisted, the full matrix then stays memory-mapped so
+    only the candidate rows are read from it.
+    """
+    
+    def __init__(
+        self,
+        dimension: int,
+        path: Optional[str] = None,
+        mmap: bool = False,
+        codec: Optional[VectorCodec] = None,
+        rerank_factor: int = 4
+    ):
+        """
+        Args:
+            dimension: Embedding dimension
+            path: Directory to persist to, or None for memory only
+            mmap: Memory-map the saved matrix read-only until the first write
+            codec: Compact representation used for the first search pass
+            rerank_factor: Candidate multiplier for full-precision rescoring (0 disables)
+        """
+        self.dimension = dimension
+        self.path = Path(path) if path else None
+        self.codec = codec if codec is not None and codec.enabled else None
+        self.rerank_factor = rerank_factor
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._bulk_depth = 0
+        self._dirty = False
+        
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._load(mmap or self.codec is not None)
+        if self.codec is not None:
+            self._rebuild_codes()
+    
+    # Persistence
+    def _load(self, mmap: bool):
+        """Load a previously saved matrix and documents"""
+        vectors_file = self.path / "vectors.npy"
+        docs_file = self.path / "documents.json"
+        if not vectors_file.exists() or not docs_file.exists():
+            return
+        
+        with open(docs_file, encoding="utf-8") as f:
+            docs = json.load(f)
+        self._vectors = np.load(vectors_file, mmap_mode="r" if mmap else None)
+        self._ids = docs["ids"]
+        self._texts = docs["texts"]
+        self._metadatas = docs["metadatas"]
+        self._size = len(self._ids)
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+    
+    def _save(self):
+        """Atomically write the matrix and documents (caller holds the lock)"""
+        if self.path is None:
+            return
+        if self._bulk_depth:
+            # Rewriting everything per batch would make bulk loads quadratic
+            self._dirty = True
+            return
+        self._dirty = False
+        
+        vectors_tmp = self.path / "vectors.tmp.npy"
+        docs_tmp = self.path / "documents.tmp.json"
+        np.save(vectors_tmp, self._vectors[:self._size])
+        with open(docs_tmp, "w", encoding="utf-8") as f:
+            json.dump({"ids": self._ids, "texts": self._texts, "metadatas": self._metadatas}, f)
+        os.replace(vectors_tmp, self.path / "vectors.npy")
+        os.replace(docs_tmp, self.path / "documents.json")
+        
+        if self.codec is not None:
+            # Full vectors are only read for rescoring; keep them off-heap
+            self._vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+    
+    @contextmanager
+    def bulk_write(self):
+        """Defer saving until the outermost bulk_write() block ends"""
+        with self._lock:
+            self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._bulk_depth -= 1
+                if not self._bulk_depth and self._dirty:
+                    self._save()
+    
+    # Compact codes
+    def _rebuild_codes(self):
+        """Refit the codec and re-encode every vector"""
+        if self._size:
+            self.codec.fit(self._vectors[:self._size])
+        else:
+            self.codec.reset()
+        codes, scales = self.codec.encode(self._vectors[:self._size])
+        self._codes = codes
+        self._scales = scales
+    
+    def _set_codes(self, rows: List[int], vectors: np.ndarray):
+        """Encode vectors into the given rows, growing the code arrays as needed"""
+        if not self.codec.fitted:
+            # Fit on everything stored so far (PCA may now have enough rows);
+            # a new projection means re-encoding the existing rows too
+            self._rebuild_codes()
+            return
+        codes, scales = self.codec.encode(vectors)
+        needed = max(rows) + 1
+        if needed > self._codes.shape[0]:
+            capacity = max(needed, 2 * self._codes.shape[0], 64)
+            grown = np.zeros((capacity, codes.shape[1]), dtype=codes.dtype)
+            grown[:self._codes.shape[0]] = self._codes
+            self._codes = grown
+            grown_scales = np.ones(capacity, dtype=np.float32)
+            grown_scales[:self._scales.shape[0]] = self._scales
+            self._scales = grown_scales
+        self._codes[rows] = codes
+        self._scales[rows] = scales
+    
+    # Storage
+    def _ensure_capacity(self, extra: int):
+        """Grow the matrix geometrically (and detach it from any memory map)"""
+        needed = self._size + extra
+        if needed <= self._vectors.shape[0] and self._vectors.flags.writeable:
+            return
+        capacity = max(needed, 2 * self._vectors.shape[0], 64)
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+    
+    def _write(self, ids, embeddings, texts, metadatas, replace: bool):
+        """Insert rows, replacing existing IDs when replace is set"""
+        matrix = normalize_rows(embeddings)
+        with self._lock:
+            self._ensure_capacity(len(ids))
+            written_rows = []
+            for doc_id, vector, text, metadata in zip(ids, matrix, texts, metadatas):
+                row = self._rows.get(doc_id)
+                if row is not None and not replace:
+                    raise ValueError(f"Document already exists: {doc_id}")
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[doc_id] = row
+                    self._ids.append(doc_id)
+                    self._texts.append(text)
+                    self._metadatas.append(metadata)
+                else:
+                    self._texts[row] = text
+                    self._metadatas[row] = metadata
+                self._vectors[row] = vector
+                written_rows.append(row)
+            if self.codec is not None and written_rows:
+                self._set_codes(written_rows, matrix)
+            self._save()
+    
+    def add(self, ids, embeddings, texts, metadatas):
+        self._write(ids, embeddings, texts, metadatas, replace=False)
+    
+    def upsert(self, ids, embeddings, texts, metadatas):
+        self._write(ids, embeddings, texts, metadatas, replace=True)
+    
+    def _delete_row(self, row: int):
+        """Remove a row by moving the last row into its place (caller holds the lock)"""
+        last = self._size - 1
+        del self._rows[self._ids[row]]
+        if row != last:
+            self._vectors[row] = self._vectors[last]
+            if self.codec is not None:
+                self._codes[row] = self._codes[last]
+                self._scales[row] = self._scales[last]
+            self._ids[row] = self._ids[last]
+            self._texts[row] = self._texts[last]
+            self._metadatas[row] = self._metadatas[last]
+            self._rows[self._ids[row]] = row
+        self._ids.pop()
+        self._texts.pop()
+        self._metadatas.pop()
+        self._size -= 1
+    
+    def delete(self, ids=None, where=None):
+        with self._lock:
+            self._ensure_capacity(0)
+            for doc_id in ids or []:
+                row = self._rows.get(doc_id)
+                if row is not None:
+                    self._delete_row(row)
+            if where is not None:
+                # Walk backwards so swapped-in rows have already been checked
+                for row in range(self._size - 1, -1, -1):
+                    if row < self._size and matches_filter(self._metadatas[row], where):
+                        self._delete_row(row)
+            self._save()
+    
+    def query(self, embedding, n_results, where=None):
+        query = normalize_rows([embedding])[0]
+        with self._lock:
+            if where:
+                rows = np.fromiter(
+                    (row for row in range(self._size) if matches_filter(self._metadatas[row], where)),
+                    dtype=np.int64
+                )
+            else:
+                rows = np.arange(self._size)
+            
+            if self.codec is None:
+                scores = self._vectors[rows] @ query if where else self._vectors[:self._size] @ query
+                top = top_k(scores, n_results)
+            else:
+                codes = self._codes[rows] if where else self._codes[:self._size]
+                scales = self._scales[rows] if where else self._scales[:self._size]
+                approx = self.codec.scores(codes, scales, query)
+                if self.rerank_factor > 0:
+                    # Rescore a few candidates with full precision
+                    candidates = top_k(approx, n_results * self.rerank_factor)
+                    exact = np.asarray(self._vectors[rows[candidates]]) @ query
+                    scores = np.empty_like(approx)
+                    scores[candidates] = exact
+                    top = candidates[top_k(exact, n_results)]
+                else:
+                    scores = approx
+                    top = top_k(scores, n_results)
+            
+            results = []
+            for i in top:
+                row = int(rows[i])
+                results.append({
+                    "id": self._ids[row],
+                    "text": self._texts[row],
+                    "metadata": self._metadatas[row],
+                    "distance": float(1.0 - scores[i])
+                })
+            return results
+    
+    def count(self):
+        return self._size
+    
+    def get_embeddings(self):
+        with self._lock:
+            return np.array(self._vectors[:self._size], dtype=np.float32)
+    
+    def iter_documents(self):
+        with self._lock:
+            documents = list(zip(self._ids, self._texts, self._metadatas))
+        for doc_id, text, metadata in documents:
+            yield {"id": doc_id, "text": text, "metadata": metadata}
+    
+    def clear(self):
+        with self._lock:
+            self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+            self._size = 0
+            self._ids, self._texts, self._metadatas = [], [], []
+            self._rows = {}
+            if self.codec is not None:
+                self._rebuild_codes()
+            self._save()
+
+
+def create_vector_store() -> VectorStore:
+    """Create the vector store selected by VECTOR_STORE_BACKEND"""
+    backend = settings.VECTOR_STORE_BACKEND
+    if backend == "chroma":
+        return ChromaVectorStore(settings.VECTOR_STORE_PATH)
+    
+    codec = VectorCodec(
+        settings.VECTOR_QUANTIZATION,
+        settings.VECTOR_REDUCED_DIMENSION,
+        settings.VECTOR_REDUCTION
+    )
+    if backend == "numpy":
+        return NumpyVectorStore(
+            settings.EMBEDDING_DIMENSION,
+            path=str(Path(settings.VECTOR_STORE_PATH) / "numpy"),
+            mmap=settings.VECTOR_STORE_MMAP,
+            codec=codec,
+            rerank_factor=settings.VECTOR_RERANK_FACTOR
+        )
+    if backend == "memory":
+        return NumpyVectorStore(
+            settings.EMBEDDING_DIMENSION,
+            codec=codec,
+            rerank_factor=settings.VECTOR_RERANK_FACTOR
+        )
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {backend}")
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional
+from .embeddings import embedding_generator
+from .knowledge_base import knowledge_base
+
+
+class Warmup:
+    """Load the AI stack in a background thread and track per-stage progress"""
+    
+    def __init__(self):
+        """Register warm-up stages in the order they run"""
+        self.stages: List[Dict[str, Any]] = [
+            {"name": name, "status": "pending", "seconds": None, "error": None}
+            for name in ("vector_store", "lexical_index", "embedding_model", "model_inference")
+        ]
+        self._steps: Dict[str, Callable[[], None]] = {
+            "vector_store": lambda: knowledge_base.store.count(),
+            "lexical_index": lambda: knowledge_base.lexical_search("warm up", 1),
+            "embedding_model": lambda: embedding_generator.model,
+            # First encode pays one-off costs (tokenizer, torch kernels)
+            "model_inference": lambda: embedding_generator.model.encode("warm up"),
+        }
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    def start(self):
+        """Start warming up in the background (no-op if already started)"""
+        if self._thread is not None:
+            return
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="ai-warmup", daemon=True)
+        self._thread.start()
+    
+    def skip(self):
+        """
+        Mark stages that have not run as skipped (warm-up disabled)
+        
+        The AI stack then loads on first use and the server reports ready.
+        """
+        for stage in self.stages:
+            if stage["status"] == "pending":
+                stage["status"] = "skipped"
+    
+    def _run(self):
+        """Run each stage, recording its duration or error"""
+        for stage in self.stages:
+            stage["status"] = "running"
+            start = time.perf_counter()
+            try:
+                self._steps[stage["name"]]()
+                stage["status"] = "done"
+            except Exception as exc:
+                stage["status"] = "failed"
+                stage["error"] = str(exc)
+                print(f"⚠️ AI warm-up stage '{stage['name']}' failed: {exc}")
+            stage["seconds"] = round(time.perf_counter() - start, 3)
+        self.finished_at = time.time()
+        print("✅ AI warm-up finished")
+    
+    @property
+    def ready(self) -> bool:
+        """Whether every stage finished successfully or was skipped"""
+        return all(stage["status"] in ("done", "skipped") for stage in self.stages)
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Report warm-up progress
+        
+        Returns:
+            Dictionary with readiness, completed fraction and per-stage details
+        """
+        done = sum(1 for stage in self.stages if stage["status"] in ("done", "skipped"))
+        return {
+            "ready": self.ready,
+            "progress": done / len(self.stages),
+            "stages": [dict(stage) for stage in self.stages]
+        }
+
+
+# Global instance
+warmup = Warmup()
@@ -1,11 +1,13 @@
-from .jwt_handler import create_access_token, verify_token
+from .jwt_handler import create_access_token, create_refresh_token, verify_token
 from .password import hash_password, verify_password
-from .dependencies import get_current_user
+from .dependencies import authenticate_token, get_current_user
 
 __all__ = [
     "create_access_token",
+    "create_refresh_token",
     "verify_token",
     "hash_password",
     "verify_password",
+    "authenticate_token",
     "get_current_user"
 ]
@@ -1,24 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy import select
+from database import AsyncSessionLocal
 from models.user import User
 from .jwt_handler import verify_token
+from .user_cache import user_cache
 
 # HTTP Bearer token security
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """
     Dependency to get the current authenticated user
     
     Args:
         credentials: HTTP Bearer token credentials
-        db: Database session
         
     Returns:
         Current authenticated user
@@ -26,8 +23,19 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials)
+
+
+async def authenticate_token(token: str) -> User:
+    """
+    Resolve a bearer token to its active user
+    
+    Users of recently verified tokens come from user_cache; a database
+    session is only opened on a cache miss.
     
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
     # Verify token
     payload = verify_token(token)
     if payload is None:
@@ -46,8 +54,13 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
-    user = db.query(User).filter(User.email == email).first()
+    # Get user from the cache, or the database
+    user = user_cache.get(token)
+    if user is not None:
+        return user
+    
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,4 +74,5 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    user_cache.set(token, user, payload.get("exp"))
     return user
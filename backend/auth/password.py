@@ -1,7 +1,16 @@
+from typing import Optional, Tuple
 from passlib.context import CryptContext
+from config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes made with other rounds count as
+# outdated, so changing BCRYPT_ROUNDS upgrades them at the next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 
 def hash_password(password: str) -> str:
@@ -29,3 +38,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         True if password matches, False otherwise
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the hashing parameters changed
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored hash
+        
+    Returns:
+        (whether the password matches, new hash to store or None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def dummy_verify_password():
+    """Spend as long as a real verification (for unknown accounts)"""
+    pwd_context.dummy_verify()
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+from config import settings
+
+
+class LoginThrottle:
+    """
+    Sliding-window limits on login attempts per client IP and per account
+    
+    Every attempt counts against its IP; attempts on an account count
+    against it until one succeeds. Attempts over either limit are refused
+    before any password is hashed, so a credential-stuffing burst costs no
+    bcrypt time. Refused attempts are not counted, so a client regains
+    access once its window drains.
+    """
+    
+    def __init__(self, window: float, max_per_ip: int, max_per_account: int, max_tracked: int = 10000):
+        """
+        Args:
+            window: Window length in seconds
+            max_per_ip: Attempts allowed per IP within the window
+            max_per_account: Unsuccessful attempts allowed per account within the window
+            max_tracked: IPs/accounts remembered per kind (oldest are forgotten)
+        """
+        self.window = window
+        self.max_per_ip = max_per_ip
+        self.max_per_account = max_per_account
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._ips: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._accounts: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._allowed = 0
+        self._throttled = 0
+    
+    @staticmethod
+    def _account_key(account: str) -> str:
+        return account.strip().lower()
+    
+    def _retry_after(self, attempts: "OrderedDict[str, Deque[float]]", key: str, limit: int, now: float) -> float:
+        """Seconds until `key` is under `limit` again (0 if it already is; limit 0 is unlimited)"""
+        times = attempts.get(key)
+        if times is None or limit <= 0:
+            return 0.0
+        while times and times[0] <= now - self.window:
+            times.popleft()
+        if len(times) < limit:
+            return 0.0
+        return times[len(times) - limit] + self.window - now
+    
+    def _add(self, attempts: "OrderedDict[str, Deque[float]]", key: str, now: float):
+        times = attempts.pop(key, None) or deque()
+        times.append(now)
+        attempts[key] = times
+        while len(attempts) > self.max_tracked:
+            attempts.popitem(last=False)
+    
+    def attempt(self, ip: str, account: str) -> Optional[float]:
+        """
+        Register a login attempt
+        
+        Returns:
+            None if the attempt may proceed, otherwise seconds to wait
+        """
+        account = self._account_key(account)
+        now = time.monotonic()
+        with self._lock:
+            retry_after = max(
+                self._retry_after(self._ips, ip, self.max_per_ip, now),
+                self._retry_after(self._accounts, account, self.max_per_account, now)
+            )
+            if retry_after > 0:
+                self._throttled += 1
+                return retry_after
+            self._add(self._ips, ip, now)
+            self._add(self._accounts, account, now)
+            self._allowed += 1
+            return None
+    
+    def succeeded(self, account: str):
+        """Forget an account's attempts after a successful login"""
+        with self._lock:
+            self._accounts.pop(self._account_key(account), None)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get throttle statistics
+        
+        Returns:
+            Dictionary with tracked IPs/accounts and allowed/throttled attempts
+        """
+        with self._lock:
+            return {
+                "tracked_ips": len(self._ips),
+                "tracked_accounts": len(self._accounts),
+                "allowed": self._allowed,
+                "throttled": self._throttled
+            }
+
+
+# Global instance
+login_throttle = LoginThrottle(
+    window=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+    max_per_ip=settings.LOGIN_MAX_ATTEMPTS_PER_IP,
+    max_per_account=settings.LOGIN_MAX_FAILURES_PER_ACCOUNT
+)
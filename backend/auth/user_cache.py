@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from config import settings
+from models.user import User
+
+
+class UserCache:
+    """
+    Verified bearer tokens mapped to a snapshot of their user
+    
+    Saves the user lookup on every authenticated request. Entries expire
+    after `ttl` seconds (or when the token does, if sooner) and the least
+    recently used are dropped beyond `max_entries`. Committing a change to
+    a user drops every entry of that user, so deactivation takes effect on
+    the next request.
+    """
+    
+    def __init__(self, ttl: float = 60, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # token digest -> (expires at, user id, column values)
+        self._entries: "OrderedDict[bytes, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[bytes]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[User]:
+        """
+        Look up the user of a token
+        
+        Returns:
+            A new detached User built from the cached snapshot, or None
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            values = entry[2]
+        return User(**values)
+    
+    def set(self, token: str, user: User, token_expires_at: Optional[float] = None):
+        """
+        Cache the user a token resolved to
+        
+        Args:
+            token: Verified bearer token
+            user: User loaded for it
+            token_expires_at: Token 'exp' claim (Unix time), caps the entry's lifetime
+        """
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        lifetime = self.ttl
+        if token_expires_at is not None:
+            lifetime = min(lifetime, token_expires_at - time.time())
+        if lifetime <= 0:
+            return
+        
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        key = self._key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + lifetime, user.id, values)
+            self._tokens_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def invalidate_users(self, *user_ids: int):
+        """Drop the cached tokens of the given users"""
+        with self._lock:
+            for user_id in user_ids:
+                keys = self._tokens_by_user.pop(user_id, ())
+                for key in keys:
+                    self._entries.pop(key, None)
+                self._invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+    
+    def _remove(self, key: bytes):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._tokens_by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tokens_by_user[entry[1]]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with entry count, hits, misses and invalidations
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "users": len(self._tokens_by_user),
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "invalidations": self._invalidations
+            }
+
+
+# Global instance
+user_cache = UserCache(ttl=settings.AUTH_USER_CACHE_TTL_SECONDS, max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changed_users(session: Session, flush_context):
+    """Remember which users a session updated or deleted until it commits"""
+    changed = {instance.id for instance in (*session.dirty, *session.deleted) if isinstance(instance, User)}
+    if changed:
+        session.info.setdefault("changed_users", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session):
+    """Drop cached tokens of users the commit changed"""
+    changed = session.info.pop("changed_users", None)
+    if changed:
+        user_cache.invalidate_users(*changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session):
+    session.info.pop("changed_users", None)
@@ -0,0 +1,14 @@
+"""
+Reproducible benchmarks for the API, search and reindex hot paths
+
+Seeds a synthetic portfolio into a scratch database, drives the app
+in-process (no server, no network) and writes latency percentiles,
+throughput and peak RSS to a JSON file. Embeddings come from a
+deterministic stand-in model, so runs are offline and comparable
+between commits:
+    
+    cd backend
+    python -m benchmarks --size 1000 --concurrency 16 --output before.json
+    # ...change something...
+    python -m benchmarks --size 1000 --concurrency 16 --output after.json --compare before.json
+"""
@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+SCENARIO_NAMES = ("public", "search", "chat", "reindex")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the API, search and reindex paths in-process with a synthetic portfolio"
+    )
+    parser.add_argument("--size", type=int, default=1000, help="projects, skills and blogs to seed (each; 10-100000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight per scenario")
+    parser.add_argument("--requests", type=int, default=500, help="requests per HTTP scenario")
+    parser.add_argument("--reindex-runs", type=int, default=3, help="full reindexes in the reindex scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="unrecorded requests before each HTTP scenario")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIO_NAMES),
+        help=f"comma-separated subset of {', '.join(SCENARIO_NAMES)}"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for the portfolio and request mix")
+    parser.add_argument(
+        "--vector-store", default="memory", choices=("memory", "numpy", "chroma"),
+        help="VECTOR_STORE_BACKEND to benchmark"
+    )
+    parser.add_argument("--no-response-cache", action="store_true", help="disable the public response cache")
+    parser.add_argument("--workdir", help="directory for the scratch database and vector store (default: temporary)")
+    parser.add_argument("--output", default="benchmark.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+    
+    if not 10 <= args.size <= 100_000:
+        parser.error("--size must be between 10 and 100000")
+    if args.concurrency < 1 or args.requests < 1:
+        parser.error("--concurrency and --requests must be positive")
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIO_NAMES)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def configure_environment(args: argparse.Namespace, workdir: Path):
+    """Point the app at scratch storage; must run before config is imported"""
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{workdir / 'benchmark.db'}",
+        "DATABASE_ASYNC_URL": "",
+        "VECTOR_STORE_BACKEND": args.vector_store,
+        "VECTOR_STORE_PATH": str(workdir / "vector_store"),
+        # Every run encodes from scratch instead of reusing an earlier run's cache
+        "EMBEDDING_CACHE_ENABLED": "false",
+        "AI_WARMUP_ON_STARTUP": "false",
+        "REINDEX_DEBOUNCE_SECONDS": "0",
+        "PUBLIC_RESPONSE_CACHE_ENABLED": "false" if args.no_response_cache else "true",
+        "USE_OPENAI": "false",
+        "ADMIN_EMAIL": "benchmark@example.com",
+        "ADMIN_PASSWORD": "benchmark-password"
+    })
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="portfolio-benchmark-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    (workdir / "benchmark.db").unlink(missing_ok=True)
+    shutil.rmtree(workdir / "vector_store", ignore_errors=True)
+    configure_environment(args, workdir)
+    
+    # Imported only now, so the app reads the environment set above
+    from .runner import compare, run_benchmark
+    
+    try:
+        results = asyncio.run(run_benchmark(
+            size=args.size,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            scenarios=args.scenarios,
+            reindex_runs=args.reindex_runs,
+            warmup=args.warmup,
+            seed=args.seed
+        ))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"Results written to {args.output} (peak RSS {results['peak_rss_mb']}MB)")
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+        for line in compare(baseline, results):
+            print(line)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
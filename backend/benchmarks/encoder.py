@@ -0,0 +1,39 @@
+import re
+import zlib
+from typing import List, Union
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class HashingEncoder:
+    """
+    Deterministic stand-in for SentenceTransformer
+    
+    Hashes each word into one of `dimension` buckets with a signed weight
+    and L2-normalizes the sum, so texts sharing words stay similar and the
+    same text always maps to the same vector, on any machine. Encoding is
+    far cheaper than a transformer; benchmarks using it measure everything
+    around the model.
+    """
+    
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+    
+    def _encode_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            digest = zlib.crc32(token.encode())
+            vector[digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+    
+    def encode(self, texts: Union[str, List[str]], convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """Encode one text (1-D result) or a list of texts (2-D result)"""
+        if isinstance(texts, str):
+            return self._encode_one(texts)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.stack([self._encode_one(text) for text in texts])
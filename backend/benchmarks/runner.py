@@ -0,0 +1,299 @@
+import asyncio
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+from config import settings
+from database import SessionLocal
+from ai.embeddings import embedding_generator
+from ai.indexer import reindex_knowledge_base
+from ai.knowledge_base import knowledge_base
+from main import app
+from .encoder import HashingEncoder
+from .seed import TECHNOLOGIES, TOPICS, seed_portfolio
+
+# Seconds between reindex status polls
+REINDEX_POLL_INTERVAL = 0.02
+
+# (method, path, JSON body or None)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """q-th percentile (0-100) of sorted values, linearly interpolated"""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], statuses: Dict[int, int], elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms), throughput and status counts of one scenario"""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            "p50": round(percentile(ordered, 50) * 1000, 3),
+            "p95": round(percentile(ordered, 95) * 1000, 3),
+            "p99": round(percentile(ordered, 99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0
+        },
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Request],
+    total: int,
+    concurrency: int,
+    headers: Dict[str, str] = None
+) -> Dict[str, Any]:
+    """
+    Send `total` requests with `concurrency` in flight and summarize them
+    
+    Args:
+        client: Client bound to the app
+        make_request: Returns the i-th request
+        total: Number of requests
+        concurrency: Requests in flight at once
+        headers: Headers for every request
+    """
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    next_index = 0
+    
+    async def worker():
+        nonlocal next_index
+        while next_index < total:
+            index, next_index = next_index, next_index + 1
+            method, path, body = make_request(index)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+def public_requests(counts: Dict[str, int], seed: int) -> Callable[[int], Request]:
+    """Round-robin over the public endpoints, with seeded random ids and slugs"""
+    rng = random.Random(seed)
+    paths = [
+        lambda: "/api/public/projects?limit=20&fields=id,title,description,tech_stack",
+        lambda: f"/api/public/projects/{rng.randint(1, counts['projects'])}",
+        lambda: "/api/public/skills",
+        lambda: "/api/public/experience?limit=20",
+        lambda: "/api/public/blogs?limit=10&fields=id,title,slug,excerpt,published_at",
+        lambda: f"/api/public/blogs/post-{rng.randrange(counts['blogs'])}",
+        lambda: "/api/public/resume",
+        lambda: "/api/public/bundle?sections=experience,resume"
+    ]
+    return lambda index: ("GET", paths[index % len(paths)](), None)
+
+
+def _queries(seed: int) -> Callable[[], Tuple[str, str]]:
+    rng = random.Random(seed)
+    return lambda: (rng.choice(TOPICS), rng.choice(TECHNOLOGIES))
+
+
+def search_requests(seed: int) -> Callable[[int], Request]:
+    query = _queries(seed)
+    
+    def make(index: int) -> Request:
+        topic, technology = query()
+        return "POST", "/api/ai/search", {"query": f"{topic} {technology}", "limit": 10}
+    return make
+
+
+def chat_requests(seed: int) -> Callable[[int], Request]:
+    query = _queries(seed)
+    
+    def make(index: int) -> Request:
+        topic, technology = query()
+        return "POST", "/api/ai/chat", {"message": f"What {topic} work have you done with {technology}?"}
+    return make
+
+
+async def run_reindexes(client: httpx.AsyncClient, runs: int, headers: Dict[str, str]) -> Dict[str, Any]:
+    """Queue full reindexes through the admin API one at a time, timing each until done"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    started = time.perf_counter()
+    for _ in range(runs):
+        submitted = time.perf_counter()
+        response = await client.post("/api/admin/reindex", headers=headers)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code != 200:
+            continue
+        job_id = response.json()["job_id"]
+        while True:
+            status = (await client.get("/api/admin/reindex/status", headers=headers)).json()
+            job = next((job for job in status["done"] if job["id"] == job_id), None)
+            if job is not None:
+                break
+            await asyncio.sleep(REINDEX_POLL_INTERVAL)
+        latencies.append(time.perf_counter() - submitted)
+        if job["status"] != "done":
+            statuses[500] = statuses.get(500, 0) + 1
+    
+    result = summarize(latencies, statuses, time.perf_counter() - started)
+    result["documents"] = knowledge_base.store.count()
+    return result
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(
+    size: int,
+    concurrency: int,
+    requests: int,
+    scenarios: List[str],
+    reindex_runs: int = 3,
+    warmup: int = 10,
+    seed: int = 0,
+    progress: Callable[[str], None] = print
+) -> Dict[str, Any]:
+    """
+    Seed a portfolio, then run each scenario against the app in-process
+    
+    Args:
+        size: Projects, skills and blogs to seed (each)
+        concurrency: Requests in flight per scenario
+        requests: Requests per HTTP scenario (public, search, chat)
+        scenarios: Scenarios to run ("public", "search", "chat", "reindex")
+        reindex_runs: Full reindexes in the reindex scenario
+        warmup: Unrecorded requests sent before each HTTP scenario
+        seed: Seed for the portfolio and the request mix
+    
+    Returns:
+        Results ready to be written as JSON
+    """
+    # Offline, deterministic embeddings
+    embedding_generator._model = HashingEncoder(settings.EMBEDDING_DIMENSION)
+    
+    results: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "vector_store": settings.VECTOR_STORE_BACKEND,
+            "response_cache": settings.PUBLIC_RESPONSE_CACHE_ENABLED
+        },
+        "config": {
+            "size": size,
+            "concurrency": concurrency,
+            "requests": requests,
+            "reindex_runs": reindex_runs,
+            "warmup": warmup,
+            "seed": seed
+        },
+        "scenarios": {}
+    }
+    
+    async with app.router.lifespan_context(app):
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            counts = seed_portfolio(db, size, seed, progress)
+            results["seed"] = {"rows": counts, "seconds": round(time.perf_counter() - started, 3)}
+            
+            started = time.perf_counter()
+            documents = reindex_knowledge_base(db)
+            seconds = time.perf_counter() - started
+            results["initial_index"] = {"documents": documents, "seconds": round(seconds, 3)}
+            progress(f"Indexed {documents} documents in {seconds:.1f}s")
+        finally:
+            db.close()
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            login = await client.post(
+                "/api/auth/login",
+                data={"username": settings.ADMIN_EMAIL, "password": settings.ADMIN_PASSWORD}
+            )
+            login.raise_for_status()
+            admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            
+            http_scenarios = {
+                "public": public_requests(counts, seed),
+                "search": search_requests(seed),
+                "chat": chat_requests(seed)
+            }
+            for name in scenarios:
+                if name == "reindex":
+                    result = await run_reindexes(client, reindex_runs, admin_headers)
+                else:
+                    if warmup:
+                        await drive(client, http_scenarios[name], warmup, concurrency)
+                    result = await drive(client, http_scenarios[name], requests, concurrency)
+                results["scenarios"][name] = result
+                latency = result["latency_ms"]
+                progress(
+                    f"{name:8} {result['throughput_rps']:>9.1f} req/s  p50 {latency['p50']:.1f}ms  "
+                    f"p95 {latency['p95']:.1f}ms  p99 {latency['p99']:.1f}ms  errors {result['errors']}"
+                )
+    
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    Lines comparing two result files, scenario by scenario
+    
+    Latency changes are relative to the baseline (positive = slower).
+    """
+    lines = []
+    differing = [
+        key for key, value in current["config"].items()
+        if key != "seed" and baseline.get("config", {}).get(key) != value
+    ]
+    if differing:
+        lines.append(f"note: runs differ in {', '.join(differing)}; latencies are not directly comparable")
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        changes = []
+        for key in ("p50", "p95", "p99"):
+            old, new = before["latency_ms"][key], result["latency_ms"][key]
+            changes.append(f"{key} {new:.1f}ms ({(new - old) / old * 100:+.0f}%)" if old else f"{key} {new:.1f}ms")
+        old, new = before["throughput_rps"], result["throughput_rps"]
+        changes.append(f"throughput {new:.1f} req/s ({(new - old) / old * 100:+.0f}%)" if old else f"throughput {new:.1f}")
+        lines.append(f"{name:8} " + "  ".join(changes))
+    if "peak_rss_mb" in baseline:
+        lines.append(f"peak RSS {current['peak_rss_mb']}MB (baseline {baseline['peak_rss_mb']}MB)")
+    return lines
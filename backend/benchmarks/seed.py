@@ -0,0 +1,150 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models import Blog, Experience, Project, Resume, Skill
+
+# Rows inserted per statement while seeding
+SEED_BATCH_SIZE = 1000
+
+TECHNOLOGIES = [
+    "Python", "FastAPI", "React", "TypeScript", "PostgreSQL", "SQLite", "Docker", "Kubernetes",
+    "Redis", "GraphQL", "Rust", "Go", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Tailwind",
+    "Node.js", "AWS", "Terraform", "Kafka", "Elasticsearch", "Vue", "Django", "Flask"
+]
+TOPICS = [
+    "search", "embeddings", "caching", "latency", "dashboards", "pipelines", "recommendations",
+    "chat", "analytics", "portfolio", "automation", "monitoring", "streaming", "indexing",
+    "authentication", "payments", "notifications", "scheduling", "visualization", "testing"
+]
+WORDS = [
+    "build", "scalable", "service", "users", "data", "model", "fast", "reliable", "design",
+    "deploy", "query", "feature", "team", "product", "api", "frontend", "backend", "tooling",
+    "performance", "release", "migrate", "improve", "measure", "optimize", "learn", "ship"
+]
+SKILL_CATEGORIES = ["Programming", "Framework", "Tool", "Soft Skill"]
+PROJECT_CATEGORIES = ["Web App", "ML", "Mobile", "CLI", "Data"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    chosen = [rng.choice(WORDS if i % 3 else TOPICS) for i in range(words)]
+    return " ".join(chosen).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+def _projects(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for index in range(count):
+        stack = rng.sample(TECHNOLOGIES, 3)
+        topic = rng.choice(TOPICS)
+        yield {
+            "title": f"{topic.capitalize()} {stack[0]} project {index}",
+            "description": f"A {topic} platform built with {', '.join(stack)}. {_sentence(rng, 12)}",
+            "long_description": _paragraphs(rng, 6),
+            "theme": "netflix",
+            "tech_stack": stack,
+            "category": rng.choice(PROJECT_CATEGORIES),
+            "github_url": f"https://github.com/example/project-{index}",
+            "featured": int(index % 10 == 0),
+            "order_index": index,
+            "tags": rng.sample(TOPICS, 2)
+        }
+
+
+def _skills(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for index in range(count):
+        yield {
+            "name": f"{TECHNOLOGIES[index % len(TECHNOLOGIES)]} {index // len(TECHNOLOGIES) or ''}".strip(),
+            "category": SKILL_CATEGORIES[index % len(SKILL_CATEGORIES)],
+            "proficiency": round(rng.random(), 2),
+            "playlist_name": "Backend Beats",
+            "years_experience": round(rng.uniform(0.5, 10), 1),
+            "order_index": index
+        }
+
+
+def _blogs(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    epoch = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        topic = rng.choice(TOPICS)
+        published = index % 5 != 0
+        yield {
+            "title": f"Notes on {topic} with {rng.choice(TECHNOLOGIES)} #{index}",
+            "slug": f"post-{index}",
+            "excerpt": _sentence(rng, 20),
+            "content": "\n\n".join(_paragraphs(rng, 5) for _ in range(rng.randint(2, 6))),
+            "tags": rng.sample(TOPICS, 3),
+            "read_time": rng.randint(2, 15),
+            "published": published,
+            "published_at": epoch + timedelta(hours=index * 7) if published else None
+        }
+
+
+def _experiences(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for index in range(count):
+        yield {
+            "type": "education" if index % 4 == 0 else "work",
+            "title": "Software Engineer" if index % 4 else "BSc Computer Science",
+            "organization": f"Company {index}",
+            "location": "Remote",
+            "description": _paragraphs(rng, 3),
+            "start_date": f"{2010 + index % 14}-01",
+            "end_date": None if index == 0 else f"{2011 + index % 14}-06",
+            "is_current": index == 0,
+            "achievements": [_sentence(rng, 10) for _ in range(3)],
+            "skills_used": rng.sample(TECHNOLOGIES, 4),
+            "order_index": index
+        }
+
+
+def _insert(db: Session, model, rows: Iterator[Dict[str, Any]]) -> int:
+    """Insert generated rows in batches"""
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == SEED_BATCH_SIZE:
+            db.execute(insert(model), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+def seed_portfolio(db: Session, size: int, seed: int = 0, progress: Callable[[str], None] = print) -> Dict[str, int]:
+    """
+    Fill the database with a synthetic portfolio
+    
+    The same size and seed always produce the same rows.
+    
+    Args:
+        db: Database session (tables must exist and be empty)
+        size: Number of projects, skills and blogs each
+        seed: Random seed
+        progress: Called with a line of progress output
+    
+    Returns:
+        Row counts per table
+    """
+    rng = random.Random(seed)
+    counts = {
+        "projects": _insert(db, Project, _projects(rng, size)),
+        "skills": _insert(db, Skill, _skills(rng, size)),
+        "blogs": _insert(db, Blog, _blogs(rng, size)),
+        "experiences": _insert(db, Experience, _experiences(rng, max(1, size // 10)))
+    }
+    db.add(Resume(
+        full_name="Benchmark Person",
+        title="Full-Stack Developer",
+        summary=_paragraphs(rng, 4),
+        pdf_text="\n\n".join(_paragraphs(rng, 6) for _ in range(4))
+    ))
+    counts["resume"] = 1
+    db.commit()
+    progress(f"Seeded {', '.join(f'{count} {table}' for table, count in counts.items())}")
+    return counts
@@ -0,0 +1,134 @@
+"""
+Check that every public query is answered from an index
+
+Runs EXPLAIN on the queries behind /api/public (first and later keyset
+pages, the bundle, lookups by id/slug) against DATABASE_URL, after
+applying migrations, and exits non-zero if any of them scans a whole
+table or sorts rows instead of reading an index in order.
+    
+    cd backend
+    python check_query_plans.py
+"""
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from database import engine, upgrade_database
+from models import Blog, Experience, Project
+from routes.public import (
+    EXPERIENCE_QUERY, PROJECTS_QUERY, PUBLISHED_BLOGS_QUERY, RESUME_QUERY, SKILLS_QUERY, _page_statement
+)
+
+# PostgreSQL plan nodes that mean a full scan or an explicit sort
+POSTGRES_FAILING_NODES = {"Seq Scan", "Sort", "Incremental Sort"}
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a statement, compiled for the connection's dialect"""
+    
+    inherit_cache = False
+    
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def public_queries() -> List[Tuple[str, Any, bool]]:
+    """
+    The queries to check: (name, statement, whether a scan is acceptable)
+    
+    Page queries use the same builder as the routes, with a cursor so the
+    keyset predicate is covered too. The resume is a single-row table read
+    with LIMIT 1, so a scan there reads one row.
+    """
+    newest = datetime(2024, 1, 1)
+    queries = [
+        ("projects", PROJECTS_QUERY, False),
+        ("projects page", _page_statement(Project, Project.order_index, ("title",), 20, None), False),
+        ("projects next page", _page_statement(Project, Project.order_index, ("title",), 20, (3, 7)), False),
+        ("experience", EXPERIENCE_QUERY, False),
+        ("experience next page", _page_statement(Experience, Experience.order_index, (), 20, (3, 7)), False),
+        ("skills", SKILLS_QUERY, False),
+        ("published blogs", PUBLISHED_BLOGS_QUERY, False),
+        (
+            "published blogs next page",
+            _page_statement(Blog, Blog.published_at, ("title",), 20, (newest, 7), True, Blog.published == True),
+            False
+        ),
+        ("all blogs page", _page_statement(Blog, Blog.published_at, ("title",), 20, None, True), False),
+        ("project by id", select(Project).where(Project.id == 1), False),
+        ("blog by slug", select(Blog).where(Blog.slug == "post"), False),
+        ("resume", RESUME_QUERY, True)
+    ]
+    return queries
+
+
+def _sqlite_problems(connection: Connection, statement) -> Iterator[str]:
+    for row in connection.execute(Explain(statement)):
+        detail = row[-1]
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            yield detail
+        elif "USE TEMP B-TREE" in detail:
+            yield detail
+
+
+def _postgres_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _postgres_nodes(child)
+
+
+def _postgres_problems(connection: Connection, statement) -> Iterator[str]:
+    # Tiny tables make sequential scans look cheapest; ask what else the
+    # planner would do, which is what it does once the tables grow
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = connection.execute(Explain(statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    for node in _postgres_nodes(plan[0]["Plan"]):
+        if node["Node Type"] in POSTGRES_FAILING_NODES:
+            yield f'{node["Node Type"]} on {node.get("Relation Name", "rows")}'
+
+
+def check_query_plans() -> List[Tuple[str, str]]:
+    """
+    EXPLAIN every public query
+    
+    Returns:
+        (query name, plan step) for each full scan or sort found
+    """
+    problems_for = {"sqlite": _sqlite_problems, "postgresql": _postgres_problems}.get(engine.dialect.name)
+    if problems_for is None:
+        raise RuntimeError(f"No query plan check for {engine.dialect.name}")
+    
+    failures = []
+    with engine.begin() as connection:
+        for name, statement, scan_allowed in public_queries():
+            problems = list(problems_for(connection, statement))
+            status = "ok" if not problems or scan_allowed else "FAIL"
+            print(f"{status:4}  {name}: {'; '.join(problems) or 'index'}")
+            if status == "FAIL":
+                failures.extend((name, problem) for problem in problems)
+    return failures
+
+
+if __name__ == "__main__":
+    upgrade_database()
+    failures = check_query_plans()
+    if failures:
+        print(f"\n{len(failures)} public query plan(s) fall back to a full scan or sort")
+        sys.exit(1)
+    print("\nAll public queries use indexes")
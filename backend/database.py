@@ -1,29 +1,231 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from config import settings
 
-# Create database engine
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}  # Needed for SQLite
-    )
-else:
-    # PostgreSQL
-    engine = create_engine(settings.DATABASE_URL)
+BACKEND_DIR = Path(__file__).parent
+
+# Migration matching the schema create_all() built before migrations existed
+BASELINE_REVISION = "0001"
+
+# Async drivers used for request handlers, by database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg"
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Derive the async driver URL from a sync database URL
+    
+    sqlite:///./portfolio.db becomes sqlite+aiosqlite:///./portfolio.db and
+    postgresql://... becomes postgresql+asyncpg://...; URLs that already
+    name a driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    if "+" in parsed.drivername or parsed.drivername not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername]).render_as_string(hide_password=False)
+
+
+class PoolMetrics:
+    """Checkout counts and wait times of one engine's connection pool"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Pool = None
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+    
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+    
+    def record_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+        
+        Returns:
+            Dictionary with pool limits, connections in use and checkout waits
+        """
+        with self._lock:
+            stats = {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3)
+            }
+        if isinstance(self.pool, QueuePool):
+            stats.update({
+                "size": self.pool.size(),
+                "checked_out": self.pool.checkedout(),
+                "idle": self.pool.checkedin(),
+                "overflow": max(self.pool.overflow(), 0)
+            })
+        return stats
+
+
+def _timed_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Subclass of a queue pool that times how long each checkout waits"""
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_checkout(time.perf_counter() - started)
+        return connection
+    
+    # A class attribute survives engine.dispose(), which recreates the pool
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or database.startswith("file::memory:")
+
+
+def _engine_options(url: str, metrics: PoolMetrics, is_async: bool) -> Dict[str, Any]:
+    """create_engine() arguments for the configured pool and backend"""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        options: Dict[str, Any] = {} if is_async else {"connect_args": {"check_same_thread": False}}
+        if _is_memory_sqlite(url):
+            # One shared connection; there is nothing to pool
+            return options
+    elif backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options = {"connect_args": {"server_settings": {"statement_timeout": timeout}}}
+        else:
+            options = {"connect_args": {"options": f"-c statement_timeout={timeout}"}}
+    else:
+        options = {}
+    
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    options.update({
+        "poolclass": _timed_pool_class(base, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    })
+    return options
+
+
+def _tune_sqlite(engine: Engine):
+    """Apply the SQLITE_* pragmas to every new connection of an engine"""
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KB)}",  # Negative: KiB, not pages
+        f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}"
+    ]
+    
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _create_engines(url: str, async_url: str):
+    """Create the sync and async engines with pooling, pragmas and metrics"""
+    sync_metrics, async_metrics = PoolMetrics("sync"), PoolMetrics("async")
+    sync_engine = create_engine(url, **_engine_options(url, sync_metrics, is_async=False))
+    async_engine = create_async_engine(async_url, **_engine_options(async_url, async_metrics, is_async=True))
+    
+    for engine, metrics in ((sync_engine, sync_metrics), (async_engine.sync_engine, async_metrics)):
+        metrics.pool = engine.pool
+        if engine.dialect.name == "sqlite":
+            _tune_sqlite(engine)
+        
+        # dispose() swaps in a new pool; keep reporting the live one
+        @event.listens_for(engine, "engine_disposed")
+        def track_pool(disposed_engine, metrics=metrics):
+            metrics.pool = disposed_engine.pool
+    
+    return sync_engine, async_engine, {"sync": sync_metrics, "async": async_metrics}
+
+
+# Create database engines: sync (scripts, startup and background workers) and
+# async (request handlers, so queries never block the event loop)
+engine, async_engine, pool_metrics = _create_engines(
+    settings.DATABASE_URL,
+    settings.DATABASE_ASYNC_URL or async_database_url(settings.DATABASE_URL)
+)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session factory; objects stay readable after commit (no lazy reloads)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
 # Dependency to get database session
 def get_db():
-    """Get database session"""
+    """Get database session (sync; for scripts and background threads)"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Get async database session for request handlers"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def upgrade_database():
+    """
+    Bring the schema up to the latest Alembic migration
+    
+    Databases created by create_all() before migrations existed have the
+    tables but no alembic_version; they are stamped at the baseline first
+    so only the newer migrations run.
+    """
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "alembic_version" not in tables and "users" in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool stats for both engines"""
+    return {name: metrics.get_stats() for name, metrics in pool_metrics.items()}
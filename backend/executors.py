@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from config import settings
+from profiling import current_profile
+
+
+class ExecutorBusyError(Exception):
+    """Raised when a bounded executor's queue is full"""
+    
+    def __init__(self, name: str):
+        super().__init__(f"The {name} executor is at capacity")
+        self.name = name
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a bounded queue and queue-depth / wait-time metrics
+    
+    Blocking work (SentenceTransformer.encode, ChromaDB, bcrypt) is
+    submitted here from async handlers so it never runs on the event loop.
+    """
+    
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Args:
+            name: Pool name used in thread names and stats
+            max_workers: Number of worker threads
+            max_queue: Maximum number of tasks waiting for a worker
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._max_queue_depth = 0
+    
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the pool and await its result
+        
+        Raises:
+            ExecutorBusyError: If max_queue tasks are already waiting
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorBusyError(self.name)
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        
+        submitted = time.perf_counter()
+        # Set once the task has left the queue, by the worker or by cancellation
+        dequeued = [False]
+        call = functools.partial(self._call, submitted, dequeued, fn, *args, **kwargs)
+        # Carry context variables (request-scoped state) into the worker thread
+        context = contextvars.copy_context()
+        try:
+            future = self._pool.submit(context.run, call)
+        except BaseException:
+            self._release_unstarted(dequeued)
+            raise
+        # A task cancelled while queued (client disconnect, shutdown) never
+        # reaches _call, so its queue slot is released here instead
+        future.add_done_callback(lambda _: self._release_unstarted(dequeued))
+        return await asyncio.wrap_future(future)
+    
+    def _release_unstarted(self, dequeued: list):
+        """Free the queue slot of a task that will never run"""
+        with self._lock:
+            if not dequeued[0]:
+                dequeued[0] = True
+                self._queued -= 1
+    
+    def _call(self, submitted: float, dequeued: list, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Worker-side wrapper that records wait time and activity"""
+        wait = time.perf_counter() - submitted
+        with self._lock:
+            dequeued[0] = True
+            self._queued -= 1
+            self._active += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        # Work for a profiled request is sampled in this thread too
+        profile = current_profile.get()
+        if profile is not None:
+            profile.attach_thread()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.detach_thread()
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+        
+        Returns:
+            Dictionary with limits, queue depth, activity and wait times
+        """
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "active": self._active,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3)
+            }
+    
+    def shutdown(self):
+        """Stop accepting work and wait for running tasks"""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+# CPU-heavy AI work (embedding, vector search) gets a small dedicated pool
+ai_executor = BoundedExecutor("ai", settings.AI_EXECUTOR_WORKERS, settings.AI_EXECUTOR_MAX_QUEUE)
+
+# Password hashing (bcrypt releases the GIL); a separate pool so a login
+# storm only ever saturates logins
+auth_executor = BoundedExecutor("auth", settings.AUTH_EXECUTOR_WORKERS, settings.AUTH_EXECUTOR_MAX_QUEUE)
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Return stats for every executor"""
+    return {
+        "ai": ai_executor.get_stats(),
+        "auth": auth_executor.get_stats()
+    }
@@ -1,16 +1,30 @@
-from fastapi import FastAPI, HTTPException
+import time
+
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import hmac
 import os
 
 from config import settings
-from database import engine, Base, get_db
+from database import async_engine, get_db, get_pool_stats, upgrade_database
 from models import User, Project, Skill, Experience, Blog, Resume
 from auth.password import hash_password
 
 # Import routes
 from routes import auth, public, admin, ai
+from ai.indexer import reindex_worker
+from ai.warmup import warmup
+from executors import ExecutorBusyError, ai_executor, auth_executor, get_executor_stats
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from profiling import ProfilingMiddleware, request_profiler
+
+# Startup-time breakdown (seconds), reported by /api/ready
+startup_timings = {"imports": round(time.perf_counter() - _import_started, 3)}
 
 
 @asynccontextmanager
@@ -19,11 +33,14 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting AI Portfolio Platform...")
     
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created")
+    # Create or migrate database tables
+    step_started = time.perf_counter()
+    upgrade_database()
+    startup_timings["database_migrations"] = round(time.perf_counter() - step_started, 3)
+    print("✅ Database migrated")
     
     # Create default admin user if not exists
+    step_started = time.perf_counter()
     from sqlalchemy.orm import Session
     db = next(get_db())
     try:
@@ -43,6 +60,19 @@ async def lifespan(app: FastAPI):
             print(f"✅ Admin user already exists: {settings.ADMIN_EMAIL}")
     finally:
         db.close()
+    startup_timings["admin_user"] = round(time.perf_counter() - step_started, 3)
+    
+    # Start background knowledge base indexer
+    reindex_worker.start()
+    print("✅ Reindex worker started")
+    
+    # Load the embedding model and vector store without delaying liveness
+    if settings.AI_WARMUP_ON_STARTUP:
+        warmup.start()
+        print("✅ AI warm-up started in background")
+    else:
+        # Nothing will load up front, so readiness must not wait for it
+        warmup.skip()
     
     print("✅ Server ready!")
     
@@ -50,6 +80,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("👋 Shutting down...")
+    reindex_worker.stop()
+    ai_executor.shutdown()
+    auth_executor.shutdown()
+    await async_engine.dispose()
 
 
 # Create FastAPI app
@@ -59,6 +93,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Admin opt-in profiling; inside CORS so profile downloads carry CORS headers
+app.add_middleware(ProfilingMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,8 +103,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Reindex-Job-Id"],
 )
 
+# Request metrics; added last so it is outermost and also sees CORS preflights and errors
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Bounded executors shed load instead of queueing without limit
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    """Return 503 when a blocking-work pool is saturated"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(public.router)
@@ -90,6 +143,41 @@ async def health_check():
     }
 
 
+# Readiness endpoint
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    Readiness endpoint reporting AI warm-up progress
+    
+    Returns 503 until the embedding model and vector store are loaded,
+    so load balancers can keep traffic away from cold replicas.
+    """
+    status = warmup.status()
+    status["startup_seconds"] = startup_timings
+    status["executors"] = get_executor_stats()
+    status["database_pools"] = get_pool_stats()
+    status["profiler"] = request_profiler.get_stats()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Request, AI stage, executor and connection pool metrics
+    
+    Served in the Prometheus text format. Returns 404 when metrics are
+    disabled and 401 without the bearer token when METRICS_TOKEN is set.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), expected.encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 # Root endpoint
 @app.get("/")
 async def root():
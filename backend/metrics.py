@@ -0,0 +1,309 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) shared by the request and AI stage histograms
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Route label of requests that matched no route (keeps 404 scans from adding series)
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """
+    A named metric with a fixed set of label names
+    
+    A metric built with `collect` reads its values when scraped instead of
+    being updated in place: the callable returns label values mapped to
+    the current value (for stats another component already keeps).
+    """
+    
+    kind = "untyped"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[Labels, float]]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+        self._collect = collect
+    
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Labels, float]]:
+        """Yield (sample name, label names, label values, value)"""
+        if self._collect is not None:
+            values = list(self._collect().items())
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        for key, value in values:
+            yield self.name, self.labelnames, key, value
+    
+    def render(self) -> List[str]:
+        """Lines of this metric in the text exposition format"""
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for name, labelnames, values, value in self.samples():
+            lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set"""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1.0, **labels: str):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down per label set"""
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets per label set"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Labels, List] = {}
+    
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        # First bucket whose upper bound holds the value; +Inf otherwise
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+    
+    @contextmanager
+    def time(self, **labels: str):
+        """Observe the duration of the with-block (also when it raises)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def samples(self):
+        with self._lock:
+            series = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+        bucket_labels = self.labelnames + ("le",)
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", bucket_labels, key + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", self.labelnames, key, total
+            yield f"{self.name}_count", self.labelnames, key, cumulative
+
+
+class MetricsRegistry:
+    """Metrics rendered together by the /metrics endpoint"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), collect=None) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, collect))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), collect=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect))
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+registry = MetricsRegistry()
+
+# HTTP requests, recorded by MetricsMiddleware
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response body is sent",
+    ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",)
+)
+
+# Stages of the AI path: embedding, vector_query, chat_template, reindex
+ai_stage_duration_seconds = registry.histogram(
+    "ai_stage_duration_seconds", "Duration of AI pipeline stages", ("stage",)
+)
+ai_reindexed_documents_total = registry.counter(
+    "ai_reindexed_documents_total", "Documents written by full knowledge base reindexes"
+)
+ai_last_reindex_documents = registry.gauge(
+    "ai_last_reindex_documents", "Documents indexed by the most recent full reindex"
+)
+
+
+def _executor_stat(field: str) -> Callable[[], Dict[Labels, float]]:
+    def collect():
+        from executors import get_executor_stats
+        return {(name,): stats[field] for name, stats in get_executor_stats().items()}
+    return collect
+
+
+def _pool_stat(field: str) -> Callable[[], Dict[Labels, float]]:
+    def collect():
+        from database import get_pool_stats
+        return {(name,): stats[field] for name, stats in get_pool_stats().items() if field in stats}
+    return collect
+
+
+registry.gauge(
+    "executor_queued_tasks", "Tasks waiting for a worker in each bounded executor",
+    ("executor",), collect=_executor_stat("queue_depth")
+)
+registry.gauge(
+    "executor_active_tasks", "Tasks running in each bounded executor",
+    ("executor",), collect=_executor_stat("active")
+)
+registry.counter(
+    "executor_rejected_tasks_total", "Tasks refused by each bounded executor because its queue was full",
+    ("executor",), collect=_executor_stat("rejected")
+)
+registry.gauge(
+    "db_pool_checked_out_connections", "Connections checked out of each database pool",
+    ("engine",), collect=_pool_stat("checked_out")
+)
+registry.counter(
+    "db_pool_checkout_timeouts_total", "Pool checkouts that timed out waiting for a connection",
+    ("engine",), collect=_pool_stat("timeouts")
+)
+
+
+def _route_template(scope) -> str:
+    """Path template of the route that handled a request, e.g. /api/public/projects/{project_id}"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
+    # Mounted apps (static uploads) report their mount point
+    root_path = scope.get("root_path") or ""
+    app_root = scope.get("app_root_path") or ""
+    if root_path and root_path != app_root:
+        return root_path[len(app_root):] or root_path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests
+    
+    Requests are labelled with their route template rather than the raw
+    path, so ids and slugs do not create a series each. Latency runs until
+    the last body chunk is sent, which includes the full duration of
+    streamed responses.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        http_requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec(method=method)
+            route = _route_template(scope)
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=str(status))
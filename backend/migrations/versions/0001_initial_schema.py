@@ -0,0 +1,168 @@
+"""initial schema
+
+Tables as created by Base.metadata.create_all before migrations were
+introduced; databases created that way are stamped at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "blogs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("slug", sa.String(), nullable=False),
+        sa.Column("excerpt", sa.Text(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("cover_image_url", sa.String(), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("read_time", sa.Integer(), nullable=True),
+        sa.Column("published", sa.Boolean(), nullable=True),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("meta_description", sa.String(), nullable=True),
+        sa.Column("meta_keywords", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_blogs_id", "blogs", ["id"], unique=False)
+    op.create_index("ix_blogs_slug", "blogs", ["slug"], unique=True)
+    op.create_index("ix_blogs_title", "blogs", ["title"], unique=False)
+    
+    op.create_table(
+        "experiences",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("organization", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("start_date", sa.String(), nullable=False),
+        sa.Column("end_date", sa.String(), nullable=True),
+        sa.Column("is_current", sa.Boolean(), nullable=True),
+        sa.Column("achievements", sa.JSON(), nullable=True),
+        sa.Column("skills_used", sa.JSON(), nullable=True),
+        sa.Column("degree", sa.String(), nullable=True),
+        sa.Column("field_of_study", sa.String(), nullable=True),
+        sa.Column("gpa", sa.String(), nullable=True),
+        sa.Column("logo_url", sa.String(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_experiences_id", "experiences", ["id"], unique=False)
+    
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("long_description", sa.Text(), nullable=True),
+        sa.Column("theme", sa.String(), nullable=True),
+        sa.Column("tech_stack", sa.JSON(), nullable=True),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("github_url", sa.String(), nullable=True),
+        sa.Column("live_url", sa.String(), nullable=True),
+        sa.Column("demo_video_url", sa.String(), nullable=True),
+        sa.Column("thumbnail_url", sa.String(), nullable=True),
+        sa.Column("images", sa.JSON(), nullable=True),
+        sa.Column("featured", sa.Integer(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_projects_id", "projects", ["id"], unique=False)
+    op.create_index("ix_projects_title", "projects", ["title"], unique=False)
+    
+    op.create_table(
+        "resume",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("website", sa.String(), nullable=True),
+        sa.Column("github", sa.String(), nullable=True),
+        sa.Column("linkedin", sa.String(), nullable=True),
+        sa.Column("twitter", sa.String(), nullable=True),
+        sa.Column("leetcode", sa.String(), nullable=True),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("skills_summary", sa.JSON(), nullable=True),
+        sa.Column("experience_summary", sa.JSON(), nullable=True),
+        sa.Column("education_summary", sa.JSON(), nullable=True),
+        sa.Column("certifications", sa.JSON(), nullable=True),
+        sa.Column("pdf_url", sa.String(), nullable=True),
+        sa.Column("pdf_text", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_resume_id", "resume", ["id"], unique=False)
+    
+    op.create_table(
+        "skills",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("proficiency", sa.Float(), nullable=True),
+        sa.Column("playlist_name", sa.String(), nullable=True),
+        sa.Column("icon_url", sa.String(), nullable=True),
+        sa.Column("color", sa.String(), nullable=True),
+        sa.Column("years_experience", sa.Float(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_skills_id", "skills", ["id"], unique=False)
+    op.create_index("ix_skills_name", "skills", ["name"], unique=False)
+    
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_skills_name", table_name="skills")
+    op.drop_index("ix_skills_id", table_name="skills")
+    op.drop_table("skills")
+    op.drop_index("ix_resume_id", table_name="resume")
+    op.drop_table("resume")
+    op.drop_index("ix_projects_title", table_name="projects")
+    op.drop_index("ix_projects_id", table_name="projects")
+    op.drop_table("projects")
+    op.drop_index("ix_experiences_id", table_name="experiences")
+    op.drop_table("experiences")
+    op.drop_index("ix_blogs_title", table_name="blogs")
+    op.drop_index("ix_blogs_slug", table_name="blogs")
+    op.drop_index("ix_blogs_id", table_name="blogs")
+    op.drop_table("blogs")
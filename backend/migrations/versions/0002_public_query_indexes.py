@@ -0,0 +1,45 @@
+"""public query indexes
+
+Composite indexes matching the ORDER BY / WHERE of the queries in
+routes/public.py, so list pages and keyset cursors are read in index
+order instead of scanning and sorting the table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Blogs are listed newest first (published_at DESC NULLS LAST, id DESC)
+NEWEST_FIRST = {"published_at": "DESC NULLS LAST", "id": "DESC"}
+
+
+def upgrade():
+    # if_not_exists: databases stamped at the baseline may have been built
+    # by create_all() from models that already declare these indexes
+    op.create_index("ix_projects_order_index_id", "projects", ["order_index", "id"], if_not_exists=True)
+    op.create_index("ix_experiences_order_index_id", "experiences", ["order_index", "id"], if_not_exists=True)
+    op.create_index("ix_skills_category_order_index", "skills", ["category", "order_index"], if_not_exists=True)
+    op.create_index(
+        "ix_blogs_published_published_at_id", "blogs", ["published", "published_at", "id"],
+        postgresql_ops=NEWEST_FIRST, if_not_exists=True
+    )
+    op.create_index(
+        "ix_blogs_published_at_id", "blogs", ["published_at", "id"],
+        postgresql_ops=NEWEST_FIRST, if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_blogs_published_at_id", table_name="blogs")
+    op.drop_index("ix_blogs_published_published_at_id", table_name="blogs")
+    op.drop_index("ix_skills_category_order_index", table_name="skills")
+    op.drop_index("ix_experiences_order_index_id", table_name="experiences")
+    op.drop_index("ix_projects_order_index_id", table_name="projects")
@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, Index
 from sqlalchemy.sql import func
 from database import Base
 
 class Blog(Base):
     """Blog post model with markdown support"""
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Newest first: ORDER BY published_at DESC NULLS LAST, id DESC. SQLite
+        # reads these backwards (NULLs sort first ascending); PostgreSQL needs
+        # the order spelled out to match NULLS LAST.
+        Index(
+            "ix_blogs_published_published_at_id", "published", "published_at", "id",
+            postgresql_ops={"published_at": "DESC NULLS LAST", "id": "DESC"}
+        ),
+        Index(
+            "ix_blogs_published_at_id", "published_at", "id",
+            postgresql_ops={"published_at": "DESC NULLS LAST", "id": "DESC"}
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, Index
 from sqlalchemy.sql import func
 from database import Base
 
 class Experience(Base):
     """Work experience and education model"""
     __tablename__ = "experiences"
+    __table_args__ = (
+        # Public list order (order_index, id) and its keyset pages
+        Index("ix_experiences_order_index_id", "order_index", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
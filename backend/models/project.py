@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from database import Base
 
 class Project(Base):
     """Project model with theme selection"""
     __tablename__ = "projects"
+    __table_args__ = (
+        # Public list order (order_index, id) and its keyset pages
+        Index("ix_projects_order_index_id", "order_index", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
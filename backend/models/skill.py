@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
 from database import Base
 
 class Skill(Base):
     """Skill model with proficiency levels"""
     __tablename__ = "skills"
+    __table_args__ = (
+        # Public list order (grouped by category)
+        Index("ix_skills_category_order_index", "category", "order_index"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
@@ -0,0 +1,306 @@
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from urllib.parse import unquote_plus
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from auth.dependencies import authenticate_token
+from config import settings
+
+# Opt-in: send "X-Profile: 1" or add "?profile=1" to the request
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_FLAG_VALUES = ("1", "true", "yes")
+
+# Sampling faster than this costs more than it tells
+MIN_SAMPLE_INTERVAL_SECONDS = 0.001
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Profile of the request being handled; executors carry it into their threads
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+@lru_cache(maxsize=4096)
+def _frame_label(code) -> str:
+    """Readable, stable frame name: qualified function, file and first line"""
+    filename = code.co_filename
+    if filename.startswith(BACKEND_DIR + os.sep):
+        filename = os.path.relpath(filename, BACKEND_DIR)
+    elif "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    # ';' separates frames in the collapsed format
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class RequestProfile:
+    """
+    Wall-clock stack samples of a single request
+    
+    A sampler thread records the stacks of the threads attached to the
+    request (the event loop thread, plus executor threads while they run
+    work for it) every `interval` seconds, for at most `max_seconds`.
+    Event loop samples also include other requests the loop interleaves
+    meanwhile. Stacks are aggregated in the collapsed format that
+    flamegraph.pl and speedscope read: one line per distinct stack,
+    followed by its sample count.
+    """
+    
+    def __init__(self, interval: float, max_seconds: float, max_depth: int):
+        """
+        Args:
+            interval: Seconds between samples
+            max_seconds: Sampling stops after this long; the request itself carries on
+            max_depth: Innermost frames kept per stack
+        """
+        self.interval = max(interval, MIN_SAMPLE_INTERVAL_SECONDS)
+        self.max_seconds = max_seconds
+        self.max_depth = max_depth
+        self.samples = 0
+        self.truncated = False
+        self._lock = threading.Lock()
+        self._threads: Dict[int, str] = {}
+        self._stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+    
+    def attach_thread(self):
+        """Sample the calling thread until detach_thread()"""
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+    
+    def detach_thread(self):
+        with self._lock:
+            self._threads.pop(threading.get_ident(), None)
+    
+    def start(self):
+        """Attach the calling thread and start sampling"""
+        self.attach_thread()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._sampler.start()
+    
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self._elapsed = time.perf_counter() - self._started
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if time.perf_counter() - self._started > self.max_seconds:
+                self.truncated = True
+                return
+            self._sample()
+    
+    def _sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            threads = list(self._threads.items())
+        for ident, name in threads:
+            frame = frames.get(ident)
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if not labels:
+                continue
+            labels.append(name)
+            stack = ";".join(reversed(labels))
+            self._stacks[stack] = self._stacks.get(stack, 0) + 1
+        self.samples += 1
+    
+    @property
+    def elapsed(self) -> float:
+        """Seconds the request was profiled for"""
+        return self._elapsed
+    
+    def collapsed(self) -> str:
+        """Samples in the collapsed stack format, one stack per line"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self._stacks.items()))
+
+
+class RequestProfiler:
+    """
+    Hands out request profiles, one at a time
+    
+    A second profiling request while one is running is refused rather
+    than queued, so profiling can never pile sampler threads onto a
+    struggling server.
+    """
+    
+    def __init__(self, interval: float, max_seconds: float, max_depth: int):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.max_depth = max_depth
+        self._busy = threading.Lock()
+        self._profiles = 0
+        self._refused = 0
+    
+    def start(self) -> Optional[RequestProfile]:
+        """
+        Start profiling the calling thread
+        
+        Returns:
+            The running profile, or None if another request is being profiled
+        """
+        if not self._busy.acquire(blocking=False):
+            self._refused += 1
+            return None
+        profile = RequestProfile(self.interval, self.max_seconds, self.max_depth)
+        profile.start()
+        return profile
+    
+    def finish(self, profile: RequestProfile):
+        """Stop a profile from start() and free the slot"""
+        try:
+            profile.stop()
+        finally:
+            self._profiles += 1
+            self._busy.release()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get profiler statistics
+        
+        Returns:
+            Dictionary with limits and profiles taken/refused
+        """
+        return {
+            "enabled": settings.PROFILING_ENABLED,
+            "sample_interval_ms": self.interval * 1000,
+            "max_seconds": self.max_seconds,
+            "running": self._busy.locked(),
+            "profiles": self._profiles,
+            "refused": self._refused
+        }
+
+
+# Global instance
+request_profiler = RequestProfiler(
+    interval=settings.PROFILE_SAMPLE_INTERVAL_MS / 1000,
+    max_seconds=settings.PROFILE_MAX_SECONDS,
+    max_depth=settings.PROFILE_MAX_STACK_DEPTH
+)
+
+
+def _profile_requested(scope) -> bool:
+    """
+    Whether a request opted into profiling
+    
+    The query flag is removed from the request, so routes, cache keys and
+    ETags see the request as it would be without profiling.
+    """
+    flag = Headers(scope=scope).get(PROFILE_HEADER)
+    query_string = scope.get("query_string", b"")
+    if PROFILE_QUERY_PARAM.encode() in query_string:
+        # Drop only the profile pairs; the rest keeps its original encoding
+        kept, values = [], []
+        for pair in query_string.split(b"&"):
+            name, _, value = pair.partition(b"=")
+            if unquote_plus(name.decode("latin-1")) == PROFILE_QUERY_PARAM:
+                values.append(unquote_plus(value.decode("latin-1")))
+            else:
+                kept.append(pair)
+        if values:
+            flag = flag or values[0]
+            scope["query_string"] = b"&".join(kept)
+    return flag is not None and flag.strip().lower() in PROFILE_FLAG_VALUES
+
+
+async def _authorize(scope) -> Optional[Response]:
+    """Error response unless the request carries an active superuser's bearer token"""
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Profiling requires an admin bearer token"},
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    try:
+        user = await authenticate_token(token)
+    except HTTPException as exc:
+        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
+    if not user.is_superuser:
+        return JSONResponse(status_code=403, content={"detail": "Profiling is restricted to administrators"})
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles admin requests sent with X-Profile: 1
+    
+    The request runs normally under a RequestProfile, but its response
+    body is discarded and the collapsed stacks are returned instead, as a
+    download. The original status code and the profile's duration and
+    sample count are sent as X-Profile-* headers. Requests without the
+    flag pass straight through.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        error_response = await _authorize(scope)
+        if error_response is None:
+            profile = request_profiler.start()
+            if profile is None:
+                error_response = JSONResponse(
+                    status_code=429,
+                    content={"detail": "Another request is being profiled, please retry shortly"},
+                    headers={"Retry-After": "1"}
+                )
+        if error_response is not None:
+            await error_response(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def discard_body(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+        
+        context_token = current_profile.set(profile)
+        error = None
+        try:
+            await self.app(scope, receive, discard_body)
+        except Exception as exc:
+            # Still return the profile; the error is re-raised for the server to log
+            error = exc
+        finally:
+            current_profile.reset(context_token)
+            request_profiler.finish(profile)
+        
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        response = Response(
+            profile.collapsed(),
+            media_type="text/plain",
+            headers={
+                "Content-Disposition": f'attachment; filename="profile-{timestamp}.collapsed"',
+                "X-Profile-Response-Status": str(status),
+                "X-Profile-Seconds": f"{profile.elapsed:.3f}",
+                "X-Profile-Samples": str(profile.samples),
+                "X-Profile-Interval-Ms": f"{profile.interval * 1000:g}",
+                "X-Profile-Truncated": "true" if profile.truncated else "false"
+            }
+        )
+        await response(scope, receive, send)
+        if error is not None:
+            raise error
@@ -0,0 +1,210 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from config import settings
+
+
+def make_etag(*parts: bytes) -> str:
+    """Strong entity tag for a body (or for several parts taken together)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+class CachedResponse:
+    """A serialized response body, its entity tag and extra headers"""
+    
+    __slots__ = ("body", "etag", "headers")
+    
+    def __init__(self, body: bytes, etag: str = None, headers: Dict[str, str] = None):
+        self.body = body
+        self.etag = etag or make_etag(body)
+        self.headers = headers or {}
+
+
+class ResponseCache:
+    """
+    Serialized public responses, keyed by the tables they are built from
+    
+    Entries live under a section named after a table ("projects", "blogs",
+    ...). Committing a session that inserted, updated or deleted rows of a
+    table drops that table's section, so the admin endpoints invalidate
+    exactly the responses they change. Each section has a generation
+    counter; a response built while its section was invalidated is not
+    stored. The cache is bounded by entry count and body bytes, evicting
+    the least recently used responses first.
+    """
+    
+    def __init__(self, enabled: bool = True, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Args:
+            enabled: Store responses (lookups always miss when False)
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of the cached bodies
+        """
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+        self._invalidations = 0
+        self._evictions = 0
+    
+    def generation(self, section: str) -> int:
+        """Current generation of a section (changes on every invalidation)"""
+        return self._generations.get(section, 0)
+    
+    def get(self, section: str, key: str) -> Optional[CachedResponse]:
+        """Look up a cached response"""
+        with self._lock:
+            entry = self._entries.get((section, key))
+            if entry is None:
+                self._misses += 1
+            else:
+                self._entries.move_to_end((section, key))
+                self._hits += 1
+            return entry
+    
+    def set(self, section: str, key: str, entry: CachedResponse, generation: int) -> CachedResponse:
+        """Store a response unless its section changed since `generation`"""
+        if len(entry.body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if self.enabled and self._generations.get(section, 0) == generation:
+                previous = self._entries.pop((section, key), None)
+                if previous is not None:
+                    self._bytes -= len(previous.body)
+                self._entries[(section, key)] = entry
+                self._bytes += len(entry.body)
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted.body)
+                    self._evictions += 1
+        return entry
+    
+    def invalidate(self, *sections: str):
+        """Drop every cached response of the given sections"""
+        with self._lock:
+            for section in sections:
+                self._generations[section] = self._generations.get(section, 0) + 1
+                self._invalidations += 1
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] in sections]:
+                self._bytes -= len(self._entries.pop(entry_key).body)
+    
+    def record_not_modified(self):
+        with self._lock:
+            self._not_modified += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with size, limits, hits, misses, 304s and evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "not_modified": self._not_modified,
+                "invalidations": self._invalidations,
+                "evictions": self._evictions
+            }
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches the entity tag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+async def cached_response(
+    request: Request,
+    section: str,
+    key: str,
+    build: Callable[[], Awaitable[Optional[CachedResponse]]],
+    media_type: str = "application/json"
+) -> Optional[Response]:
+    """
+    Serve a response from the cache, building and storing it on a miss
+    
+    Args:
+        request: Incoming request (for If-None-Match)
+        section: Table the response is built from
+        key: Response identity within the section (path and parameters)
+        build: Coroutine returning the serialized response, or None if not found
+        media_type: Response content type
+    
+    Returns:
+        200 with the body, 304 if the client's copy is current, or None
+        when build() found nothing
+    """
+    entry = response_cache.get(section, key)
+    if entry is None:
+        generation = response_cache.generation(section)
+        entry = await build()
+        if entry is None:
+            return None
+        response_cache.set(section, key, entry, generation)
+    
+    return conditional_response(request, entry, media_type)
+
+
+def conditional_response(request: Request, entry: CachedResponse, media_type: str = "application/json") -> Response:
+    """200 with the cached body, or 304 if the client already has this ETag"""
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, entry.etag):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
+
+
+# Global instance
+response_cache = ResponseCache(
+    enabled=settings.PUBLIC_RESPONSE_CACHE_ENABLED,
+    max_entries=settings.PUBLIC_RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PUBLIC_RESPONSE_CACHE_MAX_BYTES
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changed_tables(session: Session, flush_context):
+    """Remember which tables a session wrote to until it commits"""
+    changed = session.info.setdefault("changed_tables", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(instance, "__tablename__", None)
+        if table:
+            changed.add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_tables(session: Session):
+    """Invalidate cached responses built from tables the commit changed"""
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        response_cache.invalidate(*changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_tables(session: Session):
+    session.info.pop("changed_tables", None)
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from pydantic import BaseModel
-from database import get_db
+from database import get_async_db
+from executors import ai_executor
+from ai.knowledge_base import knowledge_base
 from models import Project, Skill, Experience, Blog, Resume
 from auth.dependencies import get_current_user
 from models.user import User
-from ai.knowledge_base import knowledge_base
+from ai.indexer import project_document, skill_document, reindex_worker
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -64,121 +66,26 @@ class SkillUpdate(BaseModel):
     years_experience: float | None = None
 
 
-# Helper function to reindex knowledge base
-def reindex_knowledge_base(db: Session):
-    """Reindex all portfolio data in the knowledge base"""
-    # Clear existing data
-    knowledge_base.clear_all()
-    
-    documents = []
-    
-    # Index projects
-    projects = db.query(Project).all()
-    for project in projects:
-        text = f"{project.title}. {project.description}"
-        if project.long_description:
-            text += f" {project.long_description}"
-        if project.tech_stack:
-            text += f" Technologies: {', '.join(project.tech_stack)}"
-        
-        documents.append({
-            "id": f"project_{project.id}",
-            "text": text,
-            "metadata": {
-                "type": "project",
-                "title": project.title,
-                "category": project.category,
-                "tags": project.tags or []
-            }
-        })
-    
-    # Index skills
-    skills = db.query(Skill).all()
-    for skill in skills:
-        text = f"{skill.name} - {skill.category} skill with {skill.proficiency*100}% proficiency"
-        if skill.years_experience:
-            text += f", {skill.years_experience} years of experience"
-        
-        documents.append({
-            "id": f"skill_{skill.id}",
-            "text": text,
-            "metadata": {
-                "type": "skill",
-                "title": skill.name,
-                "category": skill.category
-            }
-        })
-    
-    # Index experience
-    experiences = db.query(Experience).all()
-    for exp in experiences:
-        text = f"{exp.title} at {exp.organization}"
-        if exp.description:
-            text += f". {exp.description}"
-        if exp.achievements:
-            text += f" Achievements: {' '.join(exp.achievements)}"
-        
-        documents.append({
-            "id": f"experience_{exp.id}",
-            "text": text,
-            "metadata": {
-                "type": "experience",
-                "title": f"{exp.title} at {exp.organization}",
-                "organization": exp.organization
-            }
-        })
-    
-    # Index blogs
-    blogs = db.query(Blog).filter(Blog.published == True).all()
-    for blog in blogs:
-        text = f"{blog.title}. {blog.excerpt or ''} {blog.content[:500]}"
-        
-        documents.append({
-            "id": f"blog_{blog.id}",
-            "text": text,
-            "metadata": {
-                "type": "blog",
-                "title": blog.title,
-                "tags": blog.tags or []
-            }
-        })
-    
-    # Index resume
-    resume = db.query(Resume).first()
-    if resume:
-        text = f"{resume.full_name} - {resume.title or 'Professional'}. {resume.summary or ''}"
-        if resume.pdf_text:
-            text += f" {resume.pdf_text[:1000]}"
-        
-        documents.append({
-            "id": "resume_1",
-            "text": text,
-            "metadata": {
-                "type": "resume",
-                "title": "Resume"
-            }
-        })
-    
-    # Add all documents to knowledge base
-    if documents:
-        knowledge_base.add_documents_batch(documents)
+# Header carrying the background reindex job ID on entity responses
+REINDEX_JOB_HEADER = "X-Reindex-Job-Id"
 
 
 # Project endpoints
 @router.post("/projects")
 async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new project"""
     db_project = Project(**project.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
-    # Reindex knowledge base
-    reindex_knowledge_base(db)
+    # Queue an update of this project's knowledge base entry
+    response.headers[REINDEX_JOB_HEADER] = reindex_worker.submit_upsert(project_document(db_project))
     
     return db_project
 
@@ -187,11 +94,12 @@ async def create_project(
 async def update_project(
     project_id: int,
     project: ProjectUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update a project"""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -199,11 +107,11 @@ async def update_project(
     for key, value in project.dict(exclude_unset=True).items():
         setattr(db_project, key, value)
     
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
-    # Reindex knowledge base
-    reindex_knowledge_base(db)
+    # Queue an update of this project's knowledge base entry
+    response.headers[REINDEX_JOB_HEADER] = reindex_worker.submit_upsert(project_document(db_project))
     
     return db_project
 
@@ -211,37 +119,38 @@ async def update_project(
 @router.delete("/projects/{project_id}")
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a project"""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(db_project)
-    db.commit()
+    await db.delete(db_project)
+    await db.commit()
     
-    # Reindex knowledge base
-    reindex_knowledge_base(db)
+    # Queue removal of this project's knowledge base entry
+    job_id = reindex_worker.submit_delete(f"project_{project_id}")
     
-    return {"message": "Project deleted successfully"}
+    return {"message": "Project deleted successfully", "reindex_job_id": job_id}
 
 
 # Skill endpoints
 @router.post("/skills")
 async def create_skill(
     skill: SkillCreate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new skill"""
     db_skill = Skill(**skill.dict())
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
     
-    reindex_knowledge_base(db)
+    response.headers[REINDEX_JOB_HEADER] = reindex_worker.submit_upsert(skill_document(db_skill))
     return db_skill
 
 
@@ -249,49 +158,65 @@ async def create_skill(
 async def update_skill(
     skill_id: int,
     skill: SkillUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update a skill"""
-    db_skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    db_skill = await db.get(Skill, skill_id)
     if not db_skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     
     for key, value in skill.dict(exclude_unset=True).items():
         setattr(db_skill, key, value)
     
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
     
-    reindex_knowledge_base(db)
+    response.headers[REINDEX_JOB_HEADER] = reindex_worker.submit_upsert(skill_document(db_skill))
     return db_skill
 
 
 @router.delete("/skills/{skill_id}")
 async def delete_skill(
     skill_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a skill"""
-    db_skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    db_skill = await db.get(Skill, skill_id)
     if not db_skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     
-    db.delete(db_skill)
-    db.commit()
+    await db.delete(db_skill)
+    await db.commit()
     
-    reindex_knowledge_base(db)
-    return {"message": "Skill deleted successfully"}
+    job_id = reindex_worker.submit_delete(f"skill_{skill_id}")
+    return {"message": "Skill deleted successfully", "reindex_job_id": job_id}
 
 
 # Trigger manual reindex
 @router.post("/reindex")
 async def trigger_reindex(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Manually trigger knowledge base reindexing"""
-    reindex_knowledge_base(db)
-    stats = knowledge_base.get_stats()
-    return {"message": "Knowledge base reindexed successfully", "stats": stats}
+    """Queue a full knowledge base reindex in the background"""
+    job_id = reindex_worker.submit_full()
+    return {"message": "Knowledge base reindex queued", "job_id": job_id}
+
+
+@router.get("/reindex/status")
+async def reindex_status(
+    current_user: User = Depends(get_current_user)
+):
+    """Report queued, running and finished reindex jobs with their durations"""
+    return reindex_worker.status()
+
+
+@router.get("/vector-store/compression")
+async def vector_compression_report(
+    k: int = 10,
+    current_user: User = Depends(get_current_user)
+):
+    """Report recall@k against memory for float16/int8 and reduced-dimension vectors"""
+    return await ai_executor.run(knowledge_base.compression_report, k)
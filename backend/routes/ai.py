@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from typing import List, Dict, Any
+import json
+import threading
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Any, Literal
 from ai.chat_handler import chat_handler
 from ai.search_handler import search_handler
+from executors import ai_executor, ExecutorBusyError
 
 router = APIRouter(prefix="/api/ai", tags=["AI"])
 
@@ -18,9 +22,27 @@ class ChatResponse(BaseModel):
     context_used: bool
 
 
+# A filter value: one string, or a list matching any of its strings
+FilterValue = str | List[str] | None
+
+
+class SearchFilters(BaseModel):
+    """Metadata filters; unknown keys and operator objects are rejected (422)"""
+    model_config = ConfigDict(extra="forbid")
+    
+    type: FilterValue = None
+    category: FilterValue = None
+    organization: FilterValue = None
+    tags: FilterValue = None
+    tech_stack: FilterValue = None
+
+
 class SearchRequest(BaseModel):
     query: str
-    filters: Dict[str, Any] | None = None
+    filters: SearchFilters | None = None
+    limit: int = Field(10, ge=1, le=50)
+    offset: int = Field(0, ge=0, le=200)
+    mode: Literal["auto", "vector", "lexical", "hybrid"] | None = None
 
 
 class SearchResult(BaseModel):
@@ -40,7 +62,8 @@ async def chat(request: ChatRequest):
     Processes user messages and returns AI-generated responses
     based on portfolio knowledge base
     """
-    result = chat_handler.generate_response(
+    result = await ai_executor.run(
+        chat_handler.generate_response,
         query=request.message,
         chat_history=request.chat_history
     )
@@ -48,6 +71,48 @@ async def chat(request: ChatRequest):
     return ChatResponse(**result)
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Streaming variant of the chat endpoint (Server-Sent Events)
+    
+    Sends a `sources` event as soon as retrieval is done, then one `segment`
+    event per piece of the response and a final `done` event, so the first
+    bytes never wait for the whole answer. Generation stops when the client
+    disconnects.
+    """
+    # Retrieve before streaming, so an overloaded server still answers 503
+    relevant_docs, sources, context = await ai_executor.run(chat_handler.retrieve, request.message)
+    cancelled = threading.Event()
+    segments = chat_handler.stream_response(request.message, relevant_docs, context, cancelled)
+    
+    async def events():
+        try:
+            yield _sse("sources", {"sources": sources[:3], "context_used": len(relevant_docs) > 0})
+            while not await http_request.is_disconnected():
+                segment = await ai_executor.run(next, segments, None)
+                if segment is None:
+                    yield _sse("done", {})
+                    break
+                yield _sse("segment", {"text": segment})
+        except ExecutorBusyError as exc:
+            yield _sse("error", {"detail": str(exc)})
+        finally:
+            # Also reached when the server cancels the stream on disconnect
+            cancelled.set()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/search", response_model=List[SearchResult])
 async def search(request: SearchRequest):
     """
@@ -55,18 +120,24 @@ async def search(request: SearchRequest):
     
     Performs vector similarity search across portfolio content
     """
-    results = search_handler.search(
+    results = await ai_executor.run(
+        search_handler.search,
         query=request.query,
-        filters=request.filters
+        filters=request.filters.model_dump(exclude_none=True) if request.filters else None,
+        limit=request.limit,
+        offset=request.offset,
+        mode=request.mode
     )
     
     return [SearchResult(**result) for result in results]
 
 
 @router.get("/suggestions")
-async def get_suggestions(q: str, limit: int = 5):
+async def get_suggestions(q: str, limit: int = Query(5, ge=1, le=20)):
     """
     Get search suggestions based on partial query
     """
-    suggestions = search_handler.suggest(q, limit=limit)
+    # Lookups are sub-millisecond, but the first call may build the index
+    # from the vector store, so keep it off the event loop
+    suggestions = await ai_executor.run(search_handler.suggest, q, limit)
     return {"suggestions": suggestions}
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
-from database import get_db
+from database import get_async_db
 from models.user import User
-from auth import create_access_token, create_refresh_token, verify_password, hash_password
+from auth import create_access_token, create_refresh_token
+from auth.password import dummy_verify_password, verify_and_update_password
+from auth.throttle import login_throttle
+from executors import auth_executor
 from datetime import timedelta
 from config import settings
 
@@ -24,18 +29,39 @@ class TokenRefresh(BaseModel):
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Admin login endpoint
     
-    Returns JWT access and refresh tokens
+    Returns JWT access and refresh tokens. Attempts are throttled per
+    client IP and per account (429), and bcrypt runs on the auth executor
+    (503 when saturated) so logins never stall the event loop.
     """
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = login_throttle.attempt(client_ip, form_data.username)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    
     # Find user by email
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if user:
+        valid, new_hash = await auth_executor.run(
+            verify_and_update_password, form_data.password, user.hashed_password
+        )
+    else:
+        # Take as long as a real check, so response times don't reveal accounts
+        await auth_executor.run(dummy_verify_password)
+        valid, new_hash = False, None
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -48,6 +74,13 @@ async def login(
             detail="Inactive user account"
         )
     
+    login_throttle.succeeded(form_data.username)
+    
+    # Hashing parameters changed since this password was stored
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create tokens
     access_token = create_access_token(data={"sub": user.email})
     refresh_token = create_refresh_token(data={"sub": user.email})
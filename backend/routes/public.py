@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, Select, and_, or_, select
+from database import get_async_db
 from models import Project, Skill, Experience, Blog, Resume
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from response_cache import CachedResponse, cached_response, conditional_response, make_etag, response_cache
 
 router = APIRouter(prefix="/api/public", tags=["Public"])
 
@@ -74,7 +80,7 @@ class BlogResponse(BaseModel):
     tags: list | None
     read_time: int | None
     published: bool
-    published_at: str | None
+    published_at: datetime | None
     
     class Config:
         from_attributes = True
@@ -99,62 +105,356 @@ class ResumeResponse(BaseModel):
         from_attributes = True
 
 
+# Serializers for cached responses
+PROJECT = TypeAdapter(ProjectResponse)
+PROJECT_LIST = TypeAdapter(List[ProjectResponse])
+SKILL_LIST = TypeAdapter(List[SkillResponse])
+EXPERIENCE_LIST = TypeAdapter(List[ExperienceResponse])
+BLOG = TypeAdapter(BlogResponse)
+BLOG_LIST = TypeAdapter(List[BlogResponse])
+RESUME = TypeAdapter(ResumeResponse)
+OPTIONAL_RESUME = TypeAdapter(Optional[ResumeResponse])
+
+# Keyset pagination
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Whole-collection queries, shared by the routes and the bundle; every
+# public query must be answerable from an index (see check_query_plans.py)
+PROJECTS_QUERY = select(Project).order_by(Project.order_index, Project.id)
+SKILLS_QUERY = select(Skill).order_by(Skill.category, Skill.order_index)
+EXPERIENCE_QUERY = select(Experience).order_by(Experience.order_index, Experience.id)
+PUBLISHED_BLOGS_QUERY = (
+    select(Blog).where(Blog.published == True).order_by(Blog.published_at.desc().nulls_last(), Blog.id.desc())
+)
+RESUME_QUERY = select(Resume).order_by(Resume.id).limit(1)
+
+Render = Callable[[AsyncSession], Awaitable[Optional[CachedResponse]]]
+
+
+def _serialized(statement: Select, adapter: TypeAdapter, first: bool = False) -> Render:
+    """Render function serializing a query's rows (or first row; None if not found)"""
+    async def render(db: AsyncSession) -> Optional[CachedResponse]:
+        result = (await db.execute(statement)).scalars()
+        value = result.first() if first else result.all()
+        if value is None:
+            return None
+        return CachedResponse(adapter.dump_json(adapter.validate_python(value)))
+    return render
+
+
+def _cache_key(request: Request, params: Dict[str, Any]) -> str:
+    """
+    Response cache key: the route template and the parsed parameters
+    
+    Built from the values the route used rather than the raw URL, so
+    unknown query parameters, their order and equivalent spellings
+    (limit=05, fields=title,id) cannot multiply the cached entries.
+    """
+    route = request.scope.get("route")
+    parts = []
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, tuple):
+            value = ",".join(str(item) for item in value)
+        parts.append(f"{name}={value}")
+    return f"{getattr(route, 'path', request.url.path)}?{'&'.join(parts)}"
+
+
+async def _cached(
+    request: Request,
+    section: str,
+    db: AsyncSession,
+    render: Render,
+    not_found: str = None,
+    **params: Any
+):
+    """
+    Serve a public response from the response cache
+    
+    On a miss the query runs on the async session and is serialized; on a
+    hit the session never touches the database. Clients sending a matching
+    If-None-Match get 304. `params` are the route's parsed parameters,
+    which (with the route) identify the response.
+    """
+    key = _cache_key(request, params)
+    response = await cached_response(request, section, key, lambda: render(db))
+    if response is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return response
+
+
+def _parse_fields(response_model, fields: Optional[str]) -> Tuple[str, ...]:
+    """Validate a `fields=` parameter; 'id' is always included"""
+    available = tuple(response_model.model_fields)
+    if not fields:
+        return available
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(available))
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(available)}"
+        )
+    return tuple(name for name in available if name in requested or name == "id")
+
+
+@lru_cache(maxsize=128)
+def _fields_adapter(response_model, fields: Tuple[str, ...]) -> TypeAdapter:
+    """List serializer for a subset of a response model's fields"""
+    if fields == tuple(response_model.model_fields):
+        return TypeAdapter(List[response_model])
+    partial = create_model(
+        f"{response_model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (response_model.model_fields[name].annotation, ...) for name in fields}
+    )
+    return TypeAdapter(List[partial])
+
+
+def _encode_cursor(value: Any, last_id: int) -> str:
+    """Opaque cursor for the row after (sort value, id)"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, last_id]).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_column) -> Tuple[Any, int]:
+    """Decode a cursor from _encode_cursor (400 if malformed)"""
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if value is not None and isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        return value, int(last_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(sort_column, id_column, value: Any, last_id: int, descending: bool):
+    """Rows after (value, last_id) in ORDER BY sort [DESC] NULLS LAST, id [DESC]"""
+    id_after = id_column < last_id if descending else id_column > last_id
+    if value is None:
+        return and_(sort_column.is_(None), id_after)
+    beyond = sort_column < value if descending else sort_column > value
+    return or_(beyond, and_(sort_column == value, id_after), sort_column.is_(None))
+
+
+def _page_statement(
+    model,
+    sort_column,
+    fields: Tuple[str, ...],
+    limit: Optional[int],
+    cursor: Optional[Tuple[Any, int]],
+    descending: bool = False,
+    where=None
+) -> Select:
+    """Keyset query for one page; fetches one extra row to detect a next page"""
+    names = dict.fromkeys([*fields, "id", sort_column.key])
+    statement = select(*(getattr(model, name) for name in names))
+    if where is not None:
+        statement = statement.where(where)
+    if cursor is not None:
+        statement = statement.where(_after(sort_column, model.id, *cursor, descending))
+    order = sort_column.desc() if descending else sort_column.asc()
+    statement = statement.order_by(order.nulls_last(), model.id.desc() if descending else model.id.asc())
+    if limit:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+def _page(
+    model,
+    response_model,
+    sort_column,
+    fields: Tuple[str, ...],
+    limit: Optional[int],
+    cursor: Optional[Tuple[Any, int]],
+    descending: bool = False,
+    where=None
+) -> Render:
+    """
+    Render function for one page of a public list
+    
+    Only the requested columns (plus the keyset columns) are selected, so
+    list views can leave heavy Text/JSON columns in the database. When more
+    rows follow, the next page's cursor goes in the X-Next-Cursor header.
+    """
+    async def render(db: AsyncSession) -> CachedResponse:
+        statement = _page_statement(model, sort_column, fields, limit, cursor, descending, where)
+        rows = (await db.execute(statement)).all()
+        
+        headers = {}
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            headers[NEXT_CURSOR_HEADER] = _encode_cursor(getattr(rows[-1], sort_column.key), rows[-1].id)
+        
+        adapter = _fields_adapter(response_model, fields)
+        return CachedResponse(adapter.dump_json(adapter.validate_python(rows)), headers=headers)
+    return render
+
+
 @router.get("/projects", response_model=List[ProjectResponse])
-async def get_projects(db: Session = Depends(get_db)):
-    """Get all projects"""
-    projects = db.query(Project).order_by(Project.order_index).all()
-    return projects
+async def get_projects(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Get all projects
+    
+    Pass `limit` to page through them (follow X-Next-Cursor with `cursor`),
+    and `fields=id,title,...` to select only some columns.
+    """
+    selected = _parse_fields(ProjectResponse, fields)
+    after = _decode_cursor(cursor, Project.order_index) if cursor else None
+    return await _cached(
+        request, "projects", db,
+        _page(Project, ProjectResponse, Project.order_index, selected, limit, after),
+        limit=limit, cursor=after, fields=selected
+    )
 
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get a specific project by ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return await _cached(
+        request, "projects", db,
+        _serialized(select(Project).where(Project.id == project_id), PROJECT, first=True),
+        not_found="Project not found",
+        project_id=project_id
+    )
 
 
 @router.get("/skills", response_model=List[SkillResponse])
-async def get_skills(db: Session = Depends(get_db)):
+async def get_skills(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all skills"""
-    skills = db.query(Skill).order_by(Skill.category, Skill.order_index).all()
-    return skills
+    return await _cached(
+        request, "skills", db,
+        _serialized(SKILLS_QUERY, SKILL_LIST)
+    )
 
 
 @router.get("/experience", response_model=List[ExperienceResponse])
-async def get_experience(db: Session = Depends(get_db)):
-    """Get all work experience and education"""
-    experiences = db.query(Experience).order_by(Experience.order_index).all()
-    return experiences
+async def get_experience(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Get all work experience and education (paged and trimmed like projects)"""
+    selected = _parse_fields(ExperienceResponse, fields)
+    after = _decode_cursor(cursor, Experience.order_index) if cursor else None
+    return await _cached(
+        request, "experiences", db,
+        _page(Experience, ExperienceResponse, Experience.order_index, selected, limit, after),
+        limit=limit, cursor=after, fields=selected
+    )
 
 
 @router.get("/blogs", response_model=List[BlogResponse])
-async def get_blogs(published_only: bool = True, db: Session = Depends(get_db)):
-    """Get all blog posts"""
-    query = db.query(Blog)
-    if published_only:
-        query = query.filter(Blog.published == True)
-    blogs = query.order_by(Blog.published_at.desc()).all()
-    return blogs
+async def get_blogs(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    published_only: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Get all blog posts, newest first
+    
+    List views should pass e.g. `fields=id,title,slug,excerpt,published_at`
+    so the markdown content is never read.
+    """
+    selected = _parse_fields(BlogResponse, fields)
+    after = _decode_cursor(cursor, Blog.published_at) if cursor else None
+    return await _cached(
+        request, "blogs", db,
+        _page(
+            Blog, BlogResponse, Blog.published_at, selected, limit, after,
+            descending=True,
+            where=Blog.published == True if published_only else None
+        ),
+        limit=limit, cursor=after, fields=selected, published_only=published_only
+    )
 
 
 @router.get("/blogs/{slug}", response_model=BlogResponse)
-async def get_blog(slug: str, db: Session = Depends(get_db)):
+async def get_blog(slug: str, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get a specific blog post by slug"""
-    blog = db.query(Blog).filter(Blog.slug == slug).first()
-    if not blog:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="Blog post not found")
-    return blog
+    return await _cached(
+        request, "blogs", db,
+        _serialized(select(Blog).where(Blog.slug == slug), BLOG, first=True),
+        not_found="Blog post not found",
+        slug=slug
+    )
 
 
 @router.get("/resume", response_model=ResumeResponse)
-async def get_resume(db: Session = Depends(get_db)):
+async def get_resume(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get resume data"""
-    resume = db.query(Resume).first()
-    if not resume:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="Resume not found")
-    return resume
+    return await _cached(
+        request, "resume", db,
+        _serialized(RESUME_QUERY, RESUME, first=True),
+        not_found="Resume not found"
+    )
+
+
+async def _render_resume_section(db: AsyncSession) -> CachedResponse:
+    """The bundle's resume section is null rather than missing when there is none"""
+    resume = (await db.execute(RESUME_QUERY)).scalars().first()
+    return CachedResponse(OPTIONAL_RESUME.dump_json(OPTIONAL_RESUME.validate_python(resume)))
+
+
+# Sections of the bundle: name -> (cached table, serializing render function)
+BUNDLE_SECTIONS = {
+    "projects": ("projects", _serialized(PROJECTS_QUERY, PROJECT_LIST)),
+    "skills": ("skills", _serialized(SKILLS_QUERY, SKILL_LIST)),
+    "experience": ("experiences", _serialized(EXPERIENCE_QUERY, EXPERIENCE_LIST)),
+    "blogs": ("blogs", _serialized(PUBLISHED_BLOGS_QUERY, BLOG_LIST)),
+    "resume": ("resume", _render_resume_section)
+}
+
+
+@router.get("/bundle")
+async def get_bundle(request: Request, sections: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get all public collections in one response
+    
+    Sections (projects, skills, experience, blogs, resume) are serialized
+    once and cached until their table changes, so a request only joins
+    stored bytes. Use `sections=projects,skills` to pick a subset; `resume`
+    is null when there is none.
+    """
+    names = list(BUNDLE_SECTIONS)
+    if sections:
+        names = list(dict.fromkeys(name.strip() for name in sections.split(",") if name.strip()))
+        unknown = [name for name in names if name not in BUNDLE_SECTIONS]
+        if unknown or not names:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown bundle sections: {', '.join(unknown)}; choose from {', '.join(BUNDLE_SECTIONS)}"
+            )
+    
+    fragments: Dict[str, CachedResponse] = {}
+    for name in names:
+        entry = response_cache.get(BUNDLE_SECTIONS[name][0], f"bundle:{name}")
+        if entry is not None:
+            fragments[name] = entry
+    
+    # Build missing sections on the one session
+    for name in names:
+        if name in fragments:
+            continue
+        table, render = BUNDLE_SECTIONS[name]
+        generation = response_cache.generation(table)
+        entry = await render(db)
+        fragments[name] = response_cache.set(table, f"bundle:{name}", entry, generation)
+    
+    body = b"{" + b",".join(json.dumps(name).encode() + b":" + fragments[name].body for name in names) + b"}"
+    etag = make_etag(*(fragments[name].etag.encode() for name in names), ",".join(names).encode())
+    return conditional_response(request, CachedResponse(body, etag))
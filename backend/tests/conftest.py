@@ -0,0 +1,15 @@
+import os
+import tempfile
+
+# Settings are read at import time; point everything at scratch storage first
+_scratch = tempfile.mkdtemp(prefix="portfolio-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_scratch, 'test.db')}",
+    "DATABASE_ASYNC_URL": "",
+    "VECTOR_STORE_BACKEND": "memory",
+    "VECTOR_STORE_PATH": os.path.join(_scratch, "vector_store"),
+    "UPLOAD_DIR": os.path.join(_scratch, "uploads"),
+    "EMBEDDING_CACHE_ENABLED": "false",
+    "AI_WARMUP_ON_STARTUP": "false",
+    "USE_OPENAI": "false"
+})
@@ -0,0 +1,61 @@
+from ai.autocomplete import SEED_SUGGESTIONS, AutocompleteIndex, suggestion_terms
+
+
+def test_prefix_matches_every_word_start():
+    index = AutocompleteIndex()
+    index.set_source("project_1", ["Machine Learning Pipeline"])
+    assert index.suggest("mach") == ["Machine Learning Pipeline"]
+    assert index.suggest("lear") == ["Machine Learning Pipeline"]
+
+
+def test_popular_terms_rank_first():
+    index = AutocompleteIndex()
+    index.set_source("project_1", ["React", "Redis"])
+    index.set_source("project_2", ["Redis"])
+    assert index.suggest("re", limit=2) == ["Redis", "React"]
+    for _ in range(20):
+        index.record_search("react")
+    assert index.suggest("re", limit=2) == ["React", "Redis"]
+
+
+def test_typos_are_tolerated():
+    index = AutocompleteIndex()
+    index.set_source("skill_1", ["Kubernetes"])
+    assert index.suggest("kuberentes") == ["Kubernetes"]
+
+
+def test_removed_source_drops_its_terms():
+    index = AutocompleteIndex()
+    index.set_source("blog_1", ["Rust Adventures", "rust"])
+    index.set_source("blog_2", ["rust"])
+    index.remove_source("blog_1")
+    assert index.suggest("rust adv") == []
+    assert index.suggest("rust") == ["rust"]
+
+
+def test_searched_terms_do_not_outlive_their_source():
+    index = AutocompleteIndex()
+    index.set_source("project_1", ["Quantum Dashboard"])
+    for _ in range(15):
+        index.record_search("quantum dashboard")
+    index.remove_source("project_1")
+    assert index.suggest("quantum") == []
+    assert index.get_stats()["terms"] == len(SEED_SUGGESTIONS)
+
+
+def test_seed_suggestions_survive_content_changes():
+    index = AutocompleteIndex()
+    index.set_source("page_1", ["projects"])
+    index.record_search("projects")
+    index.remove_source("page_1")
+    assert index.suggest("proj") == ["projects"]
+    index.clear()
+    assert index.suggest("resu") == ["resume"]
+
+
+def test_suggestion_terms_from_metadata():
+    assert suggestion_terms({"type": "project", "title": "Portfolio", "tags": ["web", 3], "tech_stack": ["Vue"]}) == [
+        "Portfolio", "web", "Vue"
+    ]
+    assert suggestion_terms({"type": "experience", "title": "Engineer at Acme", "organization": "Acme"}) == ["Acme"]
+    assert suggestion_terms({"type": "resume", "title": "Resume"}) == []
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import pytest
+from executors import BoundedExecutor, ExecutorBusyError
+from profiling import RequestProfile, current_profile
+
+
+@pytest.fixture
+def release():
+    """Event blocking the single worker; always set on teardown so a failing test cannot hang"""
+    return threading.Event()
+
+
+@pytest.fixture
+def executor(release):
+    pool = BoundedExecutor("test", max_workers=1, max_queue=2)
+    yield pool
+    release.set()
+    pool.shutdown()
+
+
+def test_runs_callable_and_counts_it(executor):
+    assert asyncio.run(executor.run(lambda a, b=0: a + b, 1, b=2)) == 3
+    stats = executor.get_stats()
+    assert stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 0
+
+
+def test_exceptions_propagate_and_release_the_worker(executor):
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(executor.run(lambda: 1 / 0))
+    stats = executor.get_stats()
+    assert stats["active"] == 0
+    assert stats["completed"] == 1
+
+
+def test_rejects_beyond_max_queue(executor, release):
+    async def scenario():
+        blocker = asyncio.ensure_future(executor.run(release.wait))
+        while executor.get_stats()["active"] == 0:
+            await asyncio.sleep(0.001)
+        queued = [asyncio.ensure_future(executor.run(lambda: "queued")) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorBusyError):
+            await executor.run(lambda: "rejected")
+        release.set()
+        return await blocker, await asyncio.gather(*queued)
+    
+    assert asyncio.run(scenario()) == (True, ["queued", "queued"])
+    assert executor.get_stats()["rejected"] == 1
+
+
+def test_cancelled_queued_tasks_release_their_slots(executor, release):
+    async def scenario():
+        blocker = asyncio.ensure_future(executor.run(release.wait))
+        while executor.get_stats()["active"] == 0:
+            await asyncio.sleep(0.001)
+        queued = [asyncio.ensure_future(executor.run(lambda: "never")) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert executor.get_stats()["queue_depth"] == 2
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        assert executor.get_stats()["queue_depth"] == 0
+        
+        # The freed slots accept new work
+        follow_up = asyncio.ensure_future(executor.run(lambda: "ran"))
+        await asyncio.sleep(0)
+        release.set()
+        await blocker
+        return await follow_up
+    
+    assert asyncio.run(scenario()) == "ran"
+    stats = executor.get_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 0
+
+
+def test_context_variables_reach_the_worker(executor):
+    profile = RequestProfile(interval=1, max_seconds=1, max_depth=8)
+    
+    async def scenario():
+        current_profile.set(profile)
+        return await executor.run(lambda: (current_profile.get(), threading.get_ident() in profile._threads))
+    
+    seen, attached = asyncio.run(scenario())
+    assert seen is profile
+    assert attached
+    assert profile._threads == {}
@@ -0,0 +1,55 @@
+import pytest
+from auth.throttle import LoginThrottle
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("auth.throttle.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_ip_limit_refuses_until_the_window_drains(clock):
+    throttle = LoginThrottle(window=60, max_per_ip=3, max_per_account=0)
+    for account in ("a@x.io", "b@x.io", "c@x.io"):
+        assert throttle.attempt("10.0.0.1", account) is None
+        clock[0] += 10
+    assert throttle.attempt("10.0.0.1", "d@x.io") == pytest.approx(30)
+    assert throttle.attempt("10.0.0.2", "d@x.io") is None
+    clock[0] += 30
+    assert throttle.attempt("10.0.0.1", "d@x.io") is None
+
+
+def test_account_limit_applies_across_ips_and_ignores_case(clock):
+    throttle = LoginThrottle(window=60, max_per_ip=0, max_per_account=2)
+    assert throttle.attempt("10.0.0.1", "Admin@x.io") is None
+    assert throttle.attempt("10.0.0.2", "admin@x.io ") is None
+    assert throttle.attempt("10.0.0.3", "admin@x.io") == pytest.approx(60)
+
+
+def test_success_resets_the_account(clock):
+    throttle = LoginThrottle(window=60, max_per_ip=0, max_per_account=2)
+    throttle.attempt("10.0.0.1", "admin@x.io")
+    throttle.attempt("10.0.0.1", "admin@x.io")
+    throttle.succeeded("ADMIN@x.io")
+    assert throttle.attempt("10.0.0.1", "admin@x.io") is None
+
+
+def test_refused_attempts_are_not_counted(clock):
+    throttle = LoginThrottle(window=60, max_per_ip=1, max_per_account=0)
+    throttle.attempt("10.0.0.1", "a@x.io")
+    for _ in range(5):
+        clock[0] += 10
+        assert throttle.attempt("10.0.0.1", "a@x.io") is not None
+    clock[0] += 10
+    assert throttle.attempt("10.0.0.1", "a@x.io") is None
+    stats = throttle.get_stats()
+    assert (stats["allowed"], stats["throttled"]) == (2, 5)
+
+
+def test_tracked_clients_are_bounded(clock):
+    throttle = LoginThrottle(window=60, max_per_ip=1, max_per_account=1, max_tracked=3)
+    for n in range(10):
+        throttle.attempt(f"10.0.0.{n}", f"user{n}@x.io")
+    stats = throttle.get_stats()
+    assert (stats["tracked_ips"], stats["tracked_accounts"]) == (3, 3)
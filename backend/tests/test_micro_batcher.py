@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from ai.micro_batcher import MicroBatcher
+
+
+def test_concurrent_submissions_share_a_batch():
+    calls = []
+    
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+    
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait_ms=50)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(batcher.submit, ["a", "b", "a", "c"]))
+    
+    assert results == ["aa", "bb", "aa", "cc"]
+    # Duplicates are computed once
+    assert sum(len(call) for call in calls) == 3
+    assert batcher.get_stats()["items"] == 4
+
+
+def test_batch_errors_reach_every_caller_and_worker_survives():
+    fail = threading.Event()
+    fail.set()
+    
+    def flaky(items):
+        if fail.is_set():
+            raise ValueError("model failed")
+        return items
+    
+    batcher = MicroBatcher(flaky, max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.submit("x")
+    fail.clear()
+    assert batcher.submit("y") == "y"
+
+
+def test_short_result_fails_the_batch_and_worker_survives():
+    short = threading.Event()
+    short.set()
+    
+    def encode(items):
+        return items[:-1] if short.is_set() else items
+    
+    batcher = MicroBatcher(encode, max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="returned 0 results for 1 inputs"):
+        batcher.submit("x")
+    short.clear()
+    assert batcher.submit("y") == "y"
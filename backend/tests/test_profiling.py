@@ -0,0 +1,36 @@
+import pytest
+from profiling import _profile_requested
+
+
+def _scope(query_string: bytes, headers=()) -> dict:
+    return {"type": "http", "query_string": query_string, "headers": list(headers)}
+
+
+@pytest.mark.parametrize("query_string, remaining", [
+    (b"fields=id,title&profile=1&limit=5", b"fields=id,title&limit=5"),
+    (b"profile=1&q=caf%C3%A9+bar", b"q=caf%C3%A9+bar"),
+    (b"tags=a&tags=b&profile=true", b"tags=a&tags=b"),
+    (b"profile=yes", b"")
+])
+def test_query_flag_is_stripped_without_reencoding(query_string, remaining):
+    scope = _scope(query_string)
+    assert _profile_requested(scope)
+    assert scope["query_string"] == remaining
+
+
+def test_query_without_the_flag_is_untouched():
+    scope = _scope(b"fields=id,title&profiler=1&q=profile")
+    assert not _profile_requested(scope)
+    assert scope["query_string"] == b"fields=id,title&profiler=1&q=profile"
+
+
+def test_falsy_flag_is_stripped_but_not_profiled():
+    scope = _scope(b"profile=0&limit=5")
+    assert not _profile_requested(scope)
+    assert scope["query_string"] == b"limit=5"
+
+
+def test_header_flag():
+    scope = _scope(b"fields=id,title", headers=[(b"x-profile", b"1")])
+    assert _profile_requested(scope)
+    assert scope["query_string"] == b"fields=id,title"
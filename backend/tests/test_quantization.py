@@ -0,0 +1,60 @@
+import numpy as np
+from ai.quantization import VectorCodec, normalize_rows, top_k
+from ai.vector_store import NumpyVectorStore
+
+
+def _unit_vectors(count, dimension=16, seed=0):
+    return normalize_rows(np.random.default_rng(seed).normal(size=(count, dimension)))
+
+
+def test_top_k_orders_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+    assert top_k(scores, 2).tolist() == [1, 3]
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 0]
+
+
+def test_int8_codes_approximate_cosine():
+    codec = VectorCodec("int8")
+    vectors = _unit_vectors(50)
+    codec.fit(vectors)
+    codes, scales = codec.encode(vectors)
+    approx = codec.scores(codes, scales, vectors[0])
+    np.testing.assert_allclose(approx, vectors @ vectors[0], atol=0.02)
+
+
+def test_pca_is_not_fitted_from_too_few_rows():
+    codec = VectorCodec("none", dimension=4, reduction="pca")
+    codec.fit(_unit_vectors(3))
+    assert not codec.fitted
+    codec.fit(_unit_vectors(10))
+    assert codec.fitted
+    assert codec._components is not None
+
+
+def test_truncation_needs_no_samples():
+    codec = VectorCodec("float16", dimension=4, reduction="truncate")
+    codec.fit(_unit_vectors(1))
+    assert codec.fitted
+
+
+def test_store_refits_pca_once_enough_rows_exist():
+    store = NumpyVectorStore(dimension=16, codec=VectorCodec("none", dimension=4, reduction="pca"))
+    vectors = _unit_vectors(40)
+    
+    def add(rows):
+        store.add(
+            [f"doc_{i}" for i in rows],
+            vectors[rows].tolist(),
+            ["text"] * len(rows),
+            [{}] * len(rows)
+        )
+    
+    store.clear()
+    add(list(range(0, 2)))
+    assert not store.codec.fitted
+    add(list(range(2, 40)))
+    assert store.codec.fitted
+    assert store._codes.shape[1] == 4
+    # Codes of the first rows were re-encoded with the fitted projection
+    np.testing.assert_allclose(store._codes[:2], store.codec.encode(vectors[:2])[0], atol=1e-5)
+    assert store.query(vectors[0].tolist(), 1)[0]["id"] == "doc_0"
@@ -0,0 +1,58 @@
+from ai.query_cache import LRUCache, normalize_query
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2, max_bytes=1024, ttl_seconds=0, sizer=lambda value: 1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_byte_limit_bounds_the_cache():
+    cache = LRUCache(max_entries=10, max_bytes=10, ttl_seconds=0, sizer=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    cache.set("c", "xxxx")
+    cache.set("huge", "x" * 11)
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 8
+    assert cache.get("a") is None
+    assert cache.get("huge") is None
+
+
+def test_replacing_a_key_updates_its_size():
+    cache = LRUCache(max_entries=10, max_bytes=100, ttl_seconds=0, sizer=len)
+    cache.set("a", "xxxx")
+    cache.set("a", "xx")
+    assert cache.get_stats()["bytes"] == 2
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ai.query_cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_entries=10, max_bytes=1024, ttl_seconds=5, sizer=lambda value: 1)
+    cache.set("a", 1)
+    now[0] += 4
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_clear_drops_entries_and_keeps_counters():
+    cache = LRUCache(max_entries=10, max_bytes=1024, ttl_seconds=0, sizer=lambda value: 1)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["bytes"], stats["hits"], stats["misses"]) == (0, 0, 1, 1)
+
+
+def test_normalize_query():
+    assert normalize_query("  machine\tlearning \n projects ") == "machine learning projects"
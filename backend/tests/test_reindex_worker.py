@@ -0,0 +1,66 @@
+import threading
+import time
+from ai.indexer import ReindexWorker
+
+
+def _recording_worker(**kwargs):
+    worker = ReindexWorker(**kwargs)
+    applied = []
+    done = threading.Event()
+    
+    def apply(full, ops):
+        applied.append((time.monotonic(), full, dict(ops)))
+        done.set()
+    
+    worker._apply = apply
+    return worker, applied, done
+
+
+def test_edits_within_debounce_window_are_merged():
+    worker, applied, done = _recording_worker(debounce_seconds=0.1, max_wait_seconds=5)
+    worker.start()
+    try:
+        worker.submit_delete("project_1")
+        worker.submit_delete("project_2")
+        worker.submit_upsert({"id": "project_1", "text": "t", "metadata": {}})
+        assert done.wait(2)
+    finally:
+        worker.stop()
+    
+    assert len(applied) == 1
+    _, full, ops = applied[0]
+    assert not full
+    assert ops == {"project_1": {"id": "project_1", "text": "t", "metadata": {}}, "project_2": None}
+
+
+def test_full_reindex_supersedes_pending_updates():
+    worker, applied, done = _recording_worker(debounce_seconds=0.1, max_wait_seconds=5)
+    worker.start()
+    try:
+        worker.submit_delete("project_1")
+        worker.submit_full()
+        worker.submit_delete("project_2")
+        assert done.wait(2)
+    finally:
+        worker.stop()
+    
+    assert applied[0][1] is True
+    assert applied[0][2] == {}
+
+
+def test_steady_edits_are_applied_within_max_wait():
+    worker, applied, done = _recording_worker(debounce_seconds=0.2, max_wait_seconds=0.3)
+    worker.start()
+    started = time.monotonic()
+    try:
+        # Each edit arrives inside the previous one's debounce window
+        while time.monotonic() - started < 1.0:
+            worker.submit_delete(f"project_{len(applied)}")
+            time.sleep(0.05)
+        assert applied, "a steady stream of edits must not postpone indexing forever"
+        assert applied[0][0] - started < 0.3 + 0.2
+    finally:
+        worker.stop()
+    
+    history = worker.status()["done"]
+    assert all(job["status"] == "done" for job in history)
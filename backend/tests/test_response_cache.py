@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime
+import httpx
+import pytest
+from fastapi import HTTPException
+from models import Blog, Project
+from response_cache import CachedResponse, ResponseCache, response_cache
+from routes.public import _decode_cursor, _encode_cursor
+
+
+def _entry(size: int = 10) -> CachedResponse:
+    return CachedResponse(b"x" * size)
+
+
+def test_invalidation_drops_only_the_changed_section():
+    cache = ResponseCache()
+    cache.set("projects", "/a", _entry(), cache.generation("projects"))
+    cache.set("blogs", "/b", _entry(), cache.generation("blogs"))
+    cache.invalidate("projects")
+    assert cache.get("projects", "/a") is None
+    assert cache.get("blogs", "/b") is not None
+    assert cache.get_stats()["bytes"] == 10
+
+
+def test_response_built_across_an_invalidation_is_not_stored():
+    cache = ResponseCache()
+    generation = cache.generation("projects")
+    cache.invalidate("projects")
+    cache.set("projects", "/a", _entry(), generation)
+    assert cache.get("projects", "/a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    for key in ("/a", "/b"):
+        cache.set("projects", key, _entry(), 0)
+    cache.get("projects", "/a")
+    cache.set("projects", "/c", _entry(), 0)
+    assert cache.get("projects", "/b") is None
+    assert cache.get("projects", "/a") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_limit_bounds_the_cache():
+    cache = ResponseCache(max_bytes=25)
+    for key in ("/a", "/b", "/c"):
+        cache.set("projects", key, _entry(), 0)
+    cache.set("projects", "/huge", _entry(100), 0)
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 20
+    assert cache.get("projects", "/huge") is None
+
+
+def test_cursor_round_trip():
+    assert _decode_cursor(_encode_cursor(3, 17), Project.order_index) == (3, 17)
+    published = datetime(2024, 5, 1, 12, 30)
+    assert _decode_cursor(_encode_cursor(published, 4), Blog.published_at) == (published, 4)
+    assert _decode_cursor(_encode_cursor(None, 9), Blog.published_at) == (None, 9)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24", "WzFd", "WyJ4IiwgInkiXQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor, Blog.published_at)
+    assert error.value.status_code == 400
+
+
+def test_cache_key_ignores_unrecognized_query_parameters():
+    from database import async_engine, upgrade_database
+    from main import app
+    
+    upgrade_database()
+    urls = [
+        "/api/public/projects?limit=5&fields=title,id",
+        "/api/public/projects?fields=id,title&limit=05",
+        "/api/public/projects?limit=5&fields=title&utm_source=a",
+        "/api/public/projects?limit=5&fields=title&utm_source=b",
+        "/api/public/skills?nonce=1",
+        "/api/public/skills?nonce=2"
+    ]
+    
+    async def fetch():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return [await client.get(url) for url in urls]
+        finally:
+            await async_engine.dispose()
+    
+    response_cache.invalidate("projects", "skills")
+    responses = asyncio.run(fetch())
+    assert [response.status_code for response in responses] == [200] * len(urls)
+    assert response_cache.get_stats()["entries"] == 2
@@ -0,0 +1,84 @@
+import asyncio
+import httpx
+import pytest
+from ai.search_handler import SearchHandler
+from ai.vector_store import matches_filter
+
+METADATA = {"type": "project", "category": "AI", "tags": ["ml", "python"]}
+
+
+@pytest.mark.parametrize("where, expected", [
+    (None, True),
+    ({"type": "project"}, True),
+    ({"type": "blog"}, False),
+    ({"tags": "ml"}, True),
+    ({"tags": {"$in": ["go", "python"]}}, True),
+    ({"tags": {"$nin": ["ml"]}}, False),
+    ({"type": {"$ne": "blog"}}, True),
+    ({"missing": {"$in": ["x"]}}, False),
+    ({"$and": [{"type": "project"}, {"category": "AI"}]}, True),
+    ({"$and": [{"type": "project"}, {"category": "Web"}]}, False),
+    ({"$or": [{"type": "blog"}, {"tags": "ml"}]}, True),
+])
+def test_matches_filter(where, expected):
+    assert matches_filter(METADATA, where) is expected
+
+
+def test_matches_filter_rejects_unknown_operators():
+    with pytest.raises(ValueError):
+        matches_filter(METADATA, {"type": {"$gt": 1}})
+
+
+def test_build_where_translates_filters():
+    handler = SearchHandler()
+    assert handler._build_where({"type": "blog"}) == {"type": "blog"}
+    assert handler._build_where({"type": "blog", "tags": "ml", "category": ""}) == {
+        "$and": [{"type": "blog"}, {"tags": {"$in": ["ml"]}}]
+    }
+    assert handler._build_where({"category": ["AI", "Web"]}) == {"category": {"$in": ["AI", "Web"]}}
+    assert handler._build_where({"tags": []}) is None
+
+
+@pytest.mark.parametrize("filters", [
+    {"type": {"$gt": 1}},
+    {"$or": [{"type": "blog"}]},
+    {"parent_id": "blog_1"},
+    {"tags": [{"$ne": "x"}]},
+])
+def test_build_where_rejects_operators_and_unknown_keys(filters):
+    with pytest.raises(ValueError):
+        SearchHandler()._build_where(filters)
+
+
+@pytest.mark.parametrize("filters", [
+    {"type": {"$gt": 1}},
+    {"parent_id": "blog_1"},
+    {"tags": [{"$ne": "x"}]},
+    {"category": 3},
+])
+def test_search_endpoint_rejects_invalid_filters(filters):
+    from main import app
+    
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/ai/search", json={"query": "python", "filters": filters})
+    
+    assert asyncio.run(post()).status_code == 422
+
+
+def test_search_endpoint_accepts_valid_filters():
+    from main import app
+    
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/ai/search", json={
+                "query": "python",
+                "mode": "lexical",
+                "filters": {"type": ["project", "blog"], "tags": "ml", "category": None}
+            })
+    
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    assert response.json() == []
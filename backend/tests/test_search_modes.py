@@ -0,0 +1,62 @@
+import pytest
+from ai import search_handler as search_module
+from ai.search_handler import SearchHandler
+
+
+def _doc(doc_id, score, doc_type="project"):
+    return {"id": doc_id, "text": f"text of {doc_id}", "metadata": {"type": doc_type, "title": doc_id}, "score": score}
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """SearchHandler over canned rankings that counts index calls"""
+    calls = {"lexical": [], "vector": []}
+    lexical_docs = [_doc(f"lex_{i}", 10 - i) for i in range(3)]
+    vector_docs = [dict(_doc(f"vec_{i}", 0), distance=0.1 * i) for i in range(10)]
+    
+    def lexical_search(query, n_results=5, where=None):
+        calls["lexical"].append(n_results)
+        return lexical_docs[:n_results]
+    
+    def vector_search(query, n_results=5, where=None):
+        calls["vector"].append(n_results)
+        return vector_docs[:n_results]
+    
+    monkeypatch.setattr(search_module.knowledge_base, "lexical_search", lexical_search)
+    monkeypatch.setattr(search_module.knowledge_base, "search", vector_search)
+    monkeypatch.setattr(search_module.knowledge_base.autocomplete, "record_search", lambda query: None)
+    handler = SearchHandler()
+    handler.calls = calls
+    return handler
+
+
+def test_auto_uses_lexical_fast_path_for_keyword_queries(handler):
+    results = handler.search("python", limit=2, mode="auto")
+    assert [result["id"] for result in results] == ["lex_0", "lex_1"]
+    assert handler.calls["vector"] == []
+    assert len(handler.calls["lexical"]) == 1
+
+
+def test_auto_falls_back_to_hybrid_with_one_lexical_search(handler):
+    results = handler.search("python", limit=5, mode="auto")
+    assert len(results) == 5
+    assert handler.calls["lexical"] == [10]
+    assert handler.calls["vector"] == [10]
+
+
+def test_hybrid_fuses_both_rankings(handler):
+    results = handler.search("python", limit=5, mode="hybrid")
+    ids = {result["id"] for result in results}
+    assert ids & {"lex_0"} and ids & {"vec_0"}
+    assert handler.calls["lexical"] == [10]
+
+
+def test_offset_pages_through_results(handler):
+    first = handler.search("python", limit=1, mode="lexical")
+    second = handler.search("python", limit=1, offset=1, mode="lexical")
+    assert [first[0]["id"], second[0]["id"]] == ["lex_0", "lex_1"]
+
+
+def test_unknown_mode_is_rejected(handler):
+    with pytest.raises(ValueError):
+        handler.search("python", mode="fuzzy")
@@ -0,0 +1,71 @@
+import time
+from auth.user_cache import UserCache
+from database import SessionLocal, upgrade_database
+from models.user import User
+
+
+def _user(user_id: int = 1, **values) -> User:
+    return User(id=user_id, email=f"user{user_id}@example.com", hashed_password="x", is_active=True, **values)
+
+
+def test_hit_returns_a_detached_copy():
+    cache = UserCache(ttl=60)
+    cache.set("token", _user(full_name="Ada"))
+    cached = cache.get("token")
+    assert cached.full_name == "Ada"
+    cached.full_name = "Changed"
+    assert cache.get("token").full_name == "Ada"
+
+
+def test_entry_lifetime_is_capped_by_the_token():
+    cache = UserCache(ttl=60)
+    cache.set("expired", _user(), token_expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = UserCache(ttl=0)
+    cache.set("token", _user())
+    assert cache.get("token") is None
+
+
+def test_invalidate_users_drops_all_their_tokens():
+    cache = UserCache(ttl=60)
+    cache.set("a1", _user(1))
+    cache.set("a2", _user(1))
+    cache.set("b1", _user(2))
+    cache.invalidate_users(1)
+    assert cache.get("a1") is None
+    assert cache.get("a2") is None
+    assert cache.get("b1") is not None
+    assert cache.get_stats()["users"] == 1
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = UserCache(ttl=60, max_entries=2)
+    cache.set("a", _user(1))
+    cache.set("b", _user(2))
+    cache.get("a")
+    cache.set("c", _user(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get_stats()["users"] == 2
+
+
+def test_committed_user_change_invalidates_the_global_cache():
+    from auth.user_cache import user_cache
+    
+    upgrade_database()
+    with SessionLocal() as db:
+        user = User(email="cache-invalidation@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        user_cache.set("session-token", user)
+        assert user_cache.get("session-token") is not None
+        
+        user.is_active = False
+        db.commit()
+        assert user_cache.get("session-token") is None
+        
+        db.delete(user)
+        db.commit()
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from ai.embeddings import embedding_generator
+from ai.knowledge_base import KnowledgeBase
+from ai.vector_store import NumpyVectorStore, VectorStore
+
+
+def _vectors(count, dimension=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimension)).tolist()
+
+
+def _add(store, start, count, dimension=8):
+    ids = [f"doc_{i}" for i in range(start, start + count)]
+    store.add(
+        ids,
+        _vectors(count, dimension, seed=start),
+        [f"text {i}" for i in range(start, start + count)],
+        [{"type": "project" if i % 2 else "blog"} for i in range(start, start + count)]
+    )
+
+
+def test_query_returns_nearest_with_filter():
+    store = NumpyVectorStore(dimension=8)
+    _add(store, 0, 10)
+    target = store.get_embeddings()[3]
+    
+    assert store.query(target.tolist(), 1)[0]["id"] == "doc_3"
+    results = store.query(target.tolist(), 3, where={"type": "blog"})
+    assert results and all(result["metadata"]["type"] == "blog" for result in results)
+
+
+def test_delete_by_id_and_filter():
+    store = NumpyVectorStore(dimension=8)
+    _add(store, 0, 10)
+    store.delete(ids=["doc_0"])
+    store.delete(where={"type": "project"})
+    assert store.count() == 4
+    assert {doc["id"] for doc in store.iter_documents()} == {"doc_2", "doc_4", "doc_6", "doc_8"}
+
+
+def test_writes_are_persisted_and_reloaded(tmp_path):
+    store = NumpyVectorStore(dimension=8, path=str(tmp_path))
+    _add(store, 0, 5)
+    reloaded = NumpyVectorStore(dimension=8, path=str(tmp_path))
+    assert reloaded.count() == 5
+    np.testing.assert_allclose(reloaded.get_embeddings(), store.get_embeddings())
+
+
+def test_bulk_write_saves_once_at_the_end(tmp_path, monkeypatch):
+    store = NumpyVectorStore(dimension=8, path=str(tmp_path))
+    saves = []
+    real_save = np.save
+    
+    def recording_save(path, array):
+        saves.append(len(array))
+        real_save(path, array)
+    
+    monkeypatch.setattr(np, "save", recording_save)
+    
+    with store.bulk_write():
+        store.clear()
+        with store.bulk_write():
+            for start in range(0, 30, 10):
+                _add(store, start, 10)
+        store.delete(ids=["doc_0"])
+        assert saves == []
+    assert saves == [29]
+
+
+def test_bulk_write_saves_even_when_interrupted(tmp_path):
+    store = NumpyVectorStore(dimension=8, path=str(tmp_path))
+    with pytest.raises(RuntimeError):
+        with store.bulk_write():
+            _add(store, 0, 3)
+            raise RuntimeError("embedding failed")
+    assert NumpyVectorStore(dimension=8, path=str(tmp_path)).count() == 3
+
+
+class DefaultBulkWriteStore(NumpyVectorStore):
+    """A store relying on the base bulk_write, like ChromaVectorStore"""
+    
+    bulk_write = VectorStore.bulk_write
+
+
+def test_knowledge_base_writes_through_the_default_bulk_write(monkeypatch):
+    monkeypatch.setattr(embedding_generator, "generate_batch", lambda texts: _vectors(len(texts)))
+    kb = KnowledgeBase(store=DefaultBulkWriteStore(dimension=8))
+    version = kb._version
+    kb.add_document("project_1", "A portfolio site", {"type": "project"})
+    assert kb.store.count() == 1
+    assert kb._version > version
+    with kb.bulk_write():
+        kb.add_document("project_2", "A search engine", {"type": "project"})
+    assert kb.store.count() == 2
@@ -0,0 +1,36 @@
+import asyncio
+import httpx
+from ai.warmup import Warmup
+
+
+def test_skipped_warmup_reports_ready():
+    warmup = Warmup()
+    assert not warmup.ready
+    warmup.skip()
+    status = warmup.status()
+    assert status["ready"]
+    assert status["progress"] == 1.0
+    assert {stage["status"] for stage in status["stages"]} == {"skipped"}
+
+
+def test_failed_stage_is_not_ready():
+    warmup = Warmup()
+    warmup._steps = {name: (lambda: None) for name in warmup._steps}
+    warmup._steps["embedding_model"] = lambda: 1 / 0
+    warmup._run()
+    assert not warmup.ready
+    assert [stage["status"] for stage in warmup.stages].count("failed") == 1
+
+
+def test_ready_endpoint_with_warmup_disabled():
+    from main import app
+    
+    async def probe():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get("/api/ready")
+    
+    response = asyncio.run(probe())
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
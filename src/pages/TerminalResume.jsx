@@ -20,14 +20,10 @@ export default function TerminalResume() {
 
     const loadData = async () => {
         try {
-            const [resumeData, expData, skillsData] = await Promise.all([
-                publicService.getResume(),
-                publicService.getExperience(),
-                publicService.getSkills()
-            ]);
-            setResume(resumeData);
-            setExperience(expData);
-            setSkills(skillsData);
+            const bundle = await publicService.getBundle(['resume', 'experience', 'skills']);
+            setResume(bundle.resume);
+            setExperience(bundle.experience);
+            setSkills(bundle.skills);
         } catch (error) {
             console.error('Error loading data:', error);
         } finally {
@@ -58,4 +58,15 @@ export const publicService = {
         const response = await api.get('/api/public/resume');
         return response.data;
     },
+
+    /**
+     * Get several collections in one request
+     * @param {string[]} sections - Any of projects, skills, experience, blogs, resume (default: all)
+     */
+    async getBundle(sections = null) {
+        const response = await api.get('/api/public/bundle', {
+            params: sections ? { sections: sections.join(',') } : {},
+        });
+        return response.data;
+    },
 };